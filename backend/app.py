@@ -1,50 +1,65 @@
+import io
 import os
-import sys
 import traceback
 from jose import jwt
 from urllib.request import urlopen
 import json
-from flask import Flask, request, jsonify, make_response
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Request, request, jsonify, make_response, Response, stream_with_context
 from flask_cors import CORS
-from bs4 import BeautifulSoup
-import requests
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
 from newsapi import NewsApiClient
 from serpapi import GoogleSearch
-from PIL import Image
+from PIL import UnidentifiedImageError
 import pytesseract
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from moviepy.editor import VideoFileClip
-import whisper 
-import yt_dlp as ytdlp
-
-options = Options()
-options.add_argument("--headless")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-logging")
-options.add_argument("--log-level=3")
-
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-from inference.hatespeech.predict_hatespeech import predict_hatespeech
-from inference.predict import predict_with_max_voting, vectorize_text, tokenizer
 
 # ----------------------
 # Load environment vars
 # ----------------------
+# (before the backend and inference imports, which read their config at import time)
 load_dotenv()
 
+from browser_pool import get_browser_pool
+from http_fetch import fetch_text
+from extraction import extract_paragraph_text
+from ocr import ocr_image, decode_upload
+from transcription import transcribe
+from audio import load_audio
+from chunked_transcription import iter_transcript_chunks
+from media_download import download_media
+from jobs import get_job_queue, TERMINAL_STATUSES
+from workspace import new_workspace, remove_workspace, save_upload, UploadTooLarge, MAX_UPLOAD_BYTES
+from media_cache import (
+    media_cache, media_key_from_url, media_key_from_upload,
+    get_transcript as get_media_transcript, set_transcript as set_media_transcript,
+    get_result as get_media_result, set_result as set_media_result,
+)
+from url_cache import get_cached_article, cache_article, article_cache
+
+# Models are not loaded here: the registry loads each one on first use
+from inference.registry import registry, MODEL_WARMUP
+from inference.hatespeech.predict_hatespeech import HATESPEECH_MODELS
+from inference.predict import FAKE_NEWS_MODELS
+from inference.result_cache import predict_ensemble_cached, predict_hatespeech_cached, cache_stats
+from inference.token_budget import TRANSCRIPT_TEXT_STRATEGY
+from scoring import run_text_models, text_response
+
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
 API_AUDIENCE = os.getenv("API_AUDIENCE")
 ALGORITHMS = [os.getenv("ALGORITHMS", "RS256")]
 
-# ---- Get public keys from Auth0 ----
-jsonurl = urlopen(f"https://{AUTH0_DOMAIN}/.well-known/jwks.json")
-jwks = json.loads(jsonurl.read())
+# ---- Get public keys from Auth0 (fetched on first authenticated request) ----
+_jwks = None
+
+def get_jwks():
+    global _jwks
+    if _jwks is None:
+        jsonurl = urlopen(f"https://{AUTH0_DOMAIN}/.well-known/jwks.json")
+        _jwks = json.loads(jsonurl.read())
+    return _jwks
 
 # ----------------------
 # Auth0 JWT Helpers
@@ -79,7 +94,7 @@ def requires_auth(f):
             return jsonify({"error": "Invalid header"}), 401
 
         rsa_key = {}
-        for key in jwks["keys"]:
+        for key in get_jwks()["keys"]:
             if key["kid"] == unverified_header["kid"]:
                 rsa_key = {
                     "kty": key["kty"],
@@ -111,19 +126,23 @@ def requires_auth(f):
 
 
 
+# Image uploads up to this size stay in memory instead of Werkzeug's spooled temp file
+IMAGE_MEMORY_MAX_BYTES = int(os.getenv("IMAGE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class FactifyRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if (content_type or "").startswith("image/") and (total_content_length or 0) <= IMAGE_MEMORY_MAX_BYTES:
+            return io.BytesIO()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
 # Flask setup (React handles frontend, not Flask)
 app = Flask(__name__)
+app.request_class = FactifyRequest
 CORS(app)
-
-# ----------------------
-# Import your predictor
-# ----------------------
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "inference")))
-try:
-    from predict import predict_with_max_voting
-except Exception as e:
-    print("❌ Could not import predict_with_max_voting:", e)
-    predict_with_max_voting = None
+# Werkzeug rejects bigger request bodies before they are spooled to disk
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
 
 # Video scan support
 try:
@@ -142,72 +161,58 @@ pytesseract.pytesseract.tesseract_cmd = os.getenv(
     "TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 )
 
+# /analyze-batch limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "10000"))
+BATCH_FETCH_WORKERS = int(os.getenv("BATCH_FETCH_WORKERS", "8"))
+BATCH_SCORE_CHUNK = int(os.getenv("BATCH_SCORE_CHUNK", "32"))
+
 # ----------------------
 # Helpers
 # ----------------------
-def extract_text_from_image(image_path):
-    try:
-        image = Image.open(image_path)
-        return pytesseract.image_to_string(image, lang="eng").strip()
-    except Exception as e:
-        print("OCR error:", e)
-        return None
+def _uploaded_images():
+    """Every file sent as "image" or "images" (multi-image upload)"""
+    return [f for f in request.files.getlist("image") + request.files.getlist("images") if f and f.filename]
 
 def extract_article_text(url):
+    """Article text for `url`, served from the canonical-URL cache when possible"""
+    cached = get_cached_article(url)
+    if cached:
+        return cached
+    text = _extract_article_text_uncached(url)
+    cache_article(url, text)
+    return text
+
+def _extract_article_text_uncached(url):
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, timeout=8, headers=headers)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = " ".join([p.get_text() for p in soup.find_all("p")])
+        html = fetch_text(url, timeout=8)  # pooled keep-alive session + conditional GET
+        text = extract_paragraph_text(html, max_chars=1200)
         if text.strip():
-            return text[:1200]  # ✅ worked with requests
+            return text  # ✅ worked with requests
     except Exception as e:
         print("Requests parse failed, trying Selenium:", e)
 
-    # 🔄 Fallback to Selenium
+    # 🔄 Fallback to Selenium (pooled, reused headless Chrome sessions)
     try:
-        options = Options()
-        options.add_argument("--headless=new")  # no browser window
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        driver = webdriver.Chrome(options=options)
-
-        driver.get(url)
-        html = driver.page_source
-        driver.quit()
-
-        soup = BeautifulSoup(html, "html.parser")
-        text = " ".join([p.get_text() for p in soup.find_all("p")])
-        return text[:1200] if text else None
+        html = get_browser_pool().get_page_source(url)
+        text = extract_paragraph_text(html, max_chars=1200)
+        return text if text else None
     except Exception as e:
         print("Selenium fallback failed:", e)
         return None
     
-def extract_audio_from_video(video_path, audio_path="temp_audio.wav"):
-    """Convert video to .wav using moviepy"""
-    clip = VideoFileClip(video_path)
-    clip.audio.write_audiofile(audio_path, codec="pcm_s16le")
-    clip.close()
-    return audio_path
-
-
-def transcribe_audio(audio_path):
-    """Whisper transcription"""
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_path, fp16=False)
-    return result.get("text", "").strip()
-
-
-def download_video_from_url(url, output_path="downloaded_video.mp4"):
-    """Download video from YouTube/Instagram using yt-dlp"""
-    ydl_opts = {
-        "outtmpl": output_path,
-        "format": "mp4/best",
-        "quiet": True,
-    }
-    with ytdlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([url])
-    return output_path
+def extract_audio_from_video(video_path):
+    """Decode the audio track to a 16 kHz mono float32 array in memory (ffmpeg pipe, no temp WAV)"""
+    return load_audio(video_path)
+
+
+def transcribe_audio(audio):
+    """Whisper transcription (shared warm model, see transcription.py); audio is a path or 16 kHz array"""
+    return transcribe(audio)
+
+
+def download_video_from_url(url, output_path="downloaded_video.mp4", audio_only=None):
+    """Download media from YouTube/Instagram using yt-dlp (audio stream only by default, see media_download.py)"""
+    return download_media(url, output_path, audio_only=audio_only)
 
 # ----------------------
 # Routes
@@ -221,33 +226,22 @@ def analyze_text():
         # Case 1: User gives a URL
         if url:
             article_text = extract_article_text(url)  # <-- BeautifulSoup logic
-            text_snippet = article_text[:500] if article_text else "No text extracted"
         # Case 2: User directly gives text
         elif text_input:
             article_text = text_input
-            text_snippet = article_text[:500]
         else:
             return jsonify({"error": "No input provided"}), 400
         
         if not article_text:
             return jsonify({"error": "No article text extracted"}), 400
         
-        text_snippet = article_text[:500]
-        # Vectorize + Predict
-        text_vectorized = vectorize_text(article_text, tokenizer)
-        model_result = predict_with_max_voting(article_text, text_vectorized) or {}
-        # ---- Hate Speech Prediction ----
-        hate_result = predict_hatespeech([article_text])[0]
+        # Vectorize + Predict (fake news and hate speech side by side)
+        model_result, hate_result = run_text_models(article_text)
         # Extract fake/real percentages safely
         best_pred = model_result.get("best_prediction", {})
         all_models = model_result.get("all_models", {})
         # Build final response
-        response = {
-      "text_snippet": text_snippet,
-            **model_result,   # unpack everything directly
-            "hate_speech": hate_result,
-            "verified": False
-        }
+        response = text_response(article_text, model_result, hate_result)
 
         return jsonify(response), 200
 
@@ -267,112 +261,438 @@ def analyze_text():
 
 @app.route("/analyze-image", methods=["POST"])
 def analyze_image():
-    """OCR + Fake news detection from image"""
-    if "image" not in request.files:
+    """OCR + Fake news detection from one or more images (texts are joined in upload order)"""
+    image_files = _uploaded_images()
+    if not image_files:
         return jsonify({"error": "No image uploaded"}), 400
-    image_file = request.files["image"]
-    path = f"temp_{os.getpid()}.png"
     try:
-        image_file.save(path)
-        extracted_text = extract_text_from_image(path)
+        ocr_results = []
+        for image_file in image_files:
+            try:
+                image = decode_upload(image_file)
+            except UnidentifiedImageError:
+                return jsonify({"error": f"Unsupported image: {image_file.filename}"}), 400
+            with image:
+                ocr_results.append(ocr_image(image))
+        extracted_text = "\n\n".join(r["text"] for r in ocr_results if r["text"])
         if not extracted_text:
             return jsonify({"error": "No text extracted"}), 400
         
        
-        # --- Fake News Detection ---
-        text_vectorized = vectorize_text(extracted_text, tokenizer)
-        model_result = predict_with_max_voting(extracted_text, text_vectorized) or {}
-
-        # --- Hate Speech Detection ---
-        hate_result = predict_hatespeech([extracted_text])[0]
+        # --- Fake News + Hate Speech Detection ---
+        model_result, hate_result = run_text_models(extracted_text)
 
         # --- Build Response ---
-        response = {
-            "text_snippet": extracted_text[:500],
-            **model_result,
-            "hate_speech": hate_result,
-            "verified": False
-        }
+        response = text_response(
+            extracted_text, model_result, hate_result,
+            ocr=[{"regions": r["regions"], "timings": r["timings"]} for r in ocr_results],
+        )
 
         return jsonify(response), 200
 
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
-
-# ------------ Whisper model ----------------#
-whisper_model = whisper.load_model("base")
-
 @app.route("/analyze-video", methods=["POST"])
 def analyze_video():
-    video_path, audio_path = None, None
+    workdir = None
     try:
-        # ---- Uploaded file ----
+        # ---- Identify the media (platform video ID / upload content hash) ----
+        url = None
         if "video" in request.files:
             video_file = request.files["video"]
-            video_path = f"temp_video_{os.getpid()}.mp4"
-            video_file.save(video_path)
-
-        # ---- URL ----
+            media_key = media_key_from_upload(video_file)
         elif request.json and "url" in request.json:
             url = request.json["url"]
-            video_path = f"temp_video_{os.getpid()}.mp4"
-            try:
-                download_video_from_url(url, video_path)
-            except Exception as e:
-                print("Video download failed:", e)
-                return jsonify({"error": "Video download failed"}), 500
+            media_key = media_key_from_url(url)
         else:
             return jsonify({"error": "No video file or URL provided"}), 400
 
-        # ---- Convert video to audio ----
-        audio_path = f"temp_audio_{os.getpid()}.wav"
-        try:
-            extract_audio_from_video(video_path, audio_path)
-        except Exception as e:
-            print("Audio extraction failed:", e)
-            return jsonify({"error": "Audio extraction failed"}), 500
+        # ---- Seen this clip before? Skip the whole media pipeline ----
+        cached_response = get_media_result(media_key, "analyze_video")
+        if cached_response:
+            return jsonify(cached_response), 200
 
-        # ---- Transcribe ----
-        try:
-            transcript = whisper_model.transcribe(audio_path, fp16=False).get("text", "").strip()
-        except Exception as e:
-            print("Transcription failed:", e)
-            transcript = ""
+        transcript = get_media_transcript(media_key)
+        if not transcript:
+            workdir = new_workspace("video_")
+            video_path = os.path.join(workdir, "input_video.mp4")
+            # ---- Uploaded file ----
+            if url is None:
+                save_upload(video_file, video_path)
+
+            # ---- URL ----
+            else:
+                try:
+                    download_video_from_url(url, video_path)
+                except Exception as e:
+                    print("Video download failed:", e)
+                    return jsonify({"error": "Video download failed"}), 500
+
+            # ---- Convert video to audio ----
+            try:
+                audio = extract_audio_from_video(video_path)
+            except Exception as e:
+                print("Audio extraction failed:", e)
+                return jsonify({"error": "Audio extraction failed"}), 500
+
+            # ---- Transcribe ----
+            try:
+                transcript = transcribe_audio(audio)
+                set_media_transcript(media_key, transcript)
+            except Exception as e:
+                print("Transcription failed:", e)
+                transcript = ""
 
         if not transcript:
             transcript = "Transcription failed or empty"
 
         # ---- Fake news + Hate speech ----
-        text_vectorized = vectorize_text(transcript, tokenizer)
-        model_result = predict_with_max_voting(transcript, text_vectorized) or {}
-        hate_result = predict_hatespeech([transcript])[0]
+        model_result, hate_result = run_text_models(transcript, TRANSCRIPT_TEXT_STRATEGY)
 
         # ---- Build response ----
-        response = {
-            "text_snippet": transcript[:500],
-            **model_result,
-            "hate_speech": hate_result,
-            "verified": False
-        }
+        response = text_response(transcript, model_result, hate_result)
+        if transcript != "Transcription failed or empty":
+            set_media_result(media_key, "analyze_video", response)
 
         return jsonify(response), 200
 
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
     finally:
-        for f in [video_path, audio_path]:
-            if f and os.path.exists(f):
-                os.remove(f)
+        remove_workspace(workdir)
+# ----------------------
+# Chunked video analysis (server-sent events)
+# ----------------------
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _iter_video_stream(workdir, video_path, url=None):
+    """Partial transcripts + per-segment scores as each chunk is transcribed, then the overall verdict"""
+    try:
+        if url:
+            yield _sse("status", {"stage": "download"})
+            download_video_from_url(url, video_path)
+
+        # audio is decoded as it streams: the first chunk starts transcribing right away
+        yield _sse("status", {"stage": "transcribe"})
+
+        texts = []
+        for chunk in iter_transcript_chunks(video_path):
+            if chunk["text"]:
+                chunk["fake_news"], chunk["hate_speech"] = run_text_models(chunk["text"])
+                texts.append(chunk["text"])
+            yield _sse("segment", chunk)
+
+        transcript = " ".join(texts) or "Transcription failed or empty"
+        model_result, hate_result = run_text_models(transcript, TRANSCRIPT_TEXT_STRATEGY)
+        yield _sse("done", text_response(transcript, model_result, hate_result, transcript=transcript))
+    except Exception as e:
+        traceback.print_exc()
+        yield _sse("error", {"error": str(e)})
+    finally:
+        remove_workspace(workdir)
+
+
+@app.route("/analyze-video/stream", methods=["POST"])
+def analyze_video_stream():
+    """Like /analyze-video, but transcribes VAD-split chunks in parallel and streams results as SSE"""
+    workdir = new_workspace("video_stream_")
+    video_path = os.path.join(workdir, "input_video.mp4")
+    url = None
+    try:
+        if "video" in request.files:
+            save_upload(request.files["video"], video_path)
+        elif request.is_json and request.json.get("url"):
+            url = request.json["url"]
+        else:
+            remove_workspace(workdir)
+            return jsonify({"error": "No video file or URL provided"}), 400
+    except Exception:
+        remove_workspace(workdir)
+        raise
+
+    # the generator owns the workspace from here on and removes it when done
+    return Response(
+        stream_with_context(_iter_video_stream(workdir, video_path, url)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ----------------------
+# Background jobs (video / image)
+# ----------------------
+def _job_links(job_id):
+    return {"job_id": job_id, "status_url": f"/jobs/{job_id}", "events_url": f"/jobs/{job_id}/events"}
+
+
+@app.route("/jobs/video", methods=["POST"])
+def submit_video_job():
+    """Queue /analyze-video work; returns a job id immediately"""
+    workdir = new_workspace("job_")
+    try:
+        if "video" in request.files:
+            video_file = request.files["video"]
+            media_key = media_key_from_upload(video_file)
+            video_path = save_upload(video_file, os.path.join(workdir, "input_video.mp4"))
+            payload = {"video_path": video_path, "media_key": media_key, "workdir": workdir}
+        elif request.is_json and request.json.get("url"):
+            url = request.json["url"]
+            payload = {"url": url, "media_key": media_key_from_url(url), "workdir": workdir}
+        else:
+            remove_workspace(workdir)
+            return jsonify({"error": "No video file or URL provided"}), 400
+        return jsonify(_job_links(get_job_queue().submit("video", payload))), 202
+    except Exception:
+        remove_workspace(workdir)
+        raise  # handle_too_large / handle_exception turn it into a JSON error
+
+
+@app.route("/jobs/image", methods=["POST"])
+def submit_image_job():
+    """Queue /analyze-image work; returns a job id immediately"""
+    if "image" not in request.files:
+        return jsonify({"error": "No image uploaded"}), 400
+    workdir = new_workspace("job_")
+    try:
+        image_path = save_upload(request.files["image"], os.path.join(workdir, "input_image"))
+        job_id = get_job_queue().submit("image", {"image_path": image_path, "workdir": workdir})
+        return jsonify(_job_links(job_id)), 202
+    except Exception:
+        remove_workspace(workdir)
+        raise  # handle_too_large / handle_exception turn it into a JSON error
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job), 200
+
+
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """Server-sent events: one "progress" event per stage change, then "done"/"failed" with the job"""
+    job_queue = get_job_queue()
+    if job_queue.get(job_id) is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    def stream():
+        seen = 0
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                yield _sse("failed", {"error": "Unknown job"})
+                return
+            for entry in job["stages"][seen:]:
+                yield _sse("progress", {"job_id": job_id, **entry})
+            seen = len(job["stages"])
+            if job["status"] in TERMINAL_STATUSES:
+                yield _sse(job["status"], job)
+                return
+            time.sleep(0.5)
+
+    return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# ----------------------
+# Bulk analysis
+# ----------------------
+def _parse_batch_items():
+    """Read items from a JSON array / {"items": [...]} body or an uploaded JSONL file"""
+    if "file" in request.files:
+        raw = request.files["file"].read().decode("utf-8", errors="replace")
+        entries = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    else:
+        data = request.get_json(silent=True)
+        entries = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError("Expected a JSON array of items or a JSONL upload")
+
+    items = []
+    for idx, entry in enumerate(entries):
+        if isinstance(entry, str):
+            entry = {"text": entry}
+        if not isinstance(entry, dict):
+            entry = {}
+        items.append({
+            "id": entry.get("id", idx),
+            "url": entry.get("url"),
+            "text": entry.get("text"),
+        })
+    return items
+
+
+def _load_batch_item(item):
+    """Fetch stage: resolve an item to article text (never raises)"""
+    try:
+        if item["url"]:
+            item["article_text"] = extract_article_text(item["url"])
+            if not item["article_text"]:
+                item["error"] = "No article text extracted"
+        elif item["text"]:
+            item["article_text"] = item["text"]
+        else:
+            item["error"] = "No input provided"
+    except Exception as e:
+        item["error"] = str(e)
+    return item
+
+
+def _score_batch_items(items, score_pool):
+    """Scoring stage: fake-news ensemble and hate speech run side by side on the chunk"""
+    texts = [item["article_text"] for item in items]
+    fake_future = score_pool.submit(predict_ensemble_cached, texts)
+    hate_future = score_pool.submit(predict_hatespeech_cached, texts)
+    return fake_future.result(), hate_future.result()
+
+
+def _batch_line(payload):
+    return json.dumps(payload) + "\n"
+
+
+def _iter_batch_results(items):
+    """
+    Fetch items concurrently and score whatever has arrived in chunks,
+    yielding one NDJSON line per item as soon as its chunk is done.
+    """
+    fetched = queue.Queue()
+    fetch_pool = ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS)
+    score_pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        for item in items:
+            fetch_pool.submit(_load_batch_item, item).add_done_callback(lambda f: fetched.put(f.result()))
+
+        remaining = len(items)
+        while remaining:
+            # Block for the first finished item, then take whatever else is ready
+            chunk = [fetched.get()]
+            while len(chunk) < BATCH_SCORE_CHUNK:
+                try:
+                    chunk.append(fetched.get_nowait())
+                except queue.Empty:
+                    break
+            remaining -= len(chunk)
+
+            ok = [item for item in chunk if not item.get("error")]
+            for item in chunk:
+                if item.get("error"):
+                    yield _batch_line({"id": item["id"], "url": item["url"], "error": item["error"]})
+            if not ok:
+                continue
+
+            try:
+                fake_results, hate_results = _score_batch_items(ok, score_pool)
+            except Exception as e:
+                traceback.print_exc()
+                for item in ok:
+                    yield _batch_line({"id": item["id"], "url": item["url"], "error": str(e)})
+                continue
+
+            for item, model_result, hate_result in zip(ok, fake_results, hate_results):
+                yield _batch_line({
+                    "id": item["id"],
+                    "url": item["url"],
+                    **text_response(item["article_text"], model_result, hate_result),
+                })
+    finally:
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+        score_pool.shutdown(wait=False)
+
+
+@app.route("/analyze-batch", methods=["POST"])
+def analyze_batch():
+    """Bulk fake-news + hate-speech scoring, streamed back as NDJSON"""
+    try:
+        items = _parse_batch_items()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not items:
+        return jsonify({"error": "No input provided"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"Too many items (max {BATCH_MAX_ITEMS})"}), 413
+
+    return Response(stream_with_context(_iter_batch_results(items)), mimetype="application/x-ndjson")
+
+# ----------------------
+# Route selection + model warm-up
+# ----------------------
+# Models each route group needs; a worker only loads what its routes use
+ROUTE_MODELS = {
+    "text": FAKE_NEWS_MODELS + HATESPEECH_MODELS,
+    "image": FAKE_NEWS_MODELS + HATESPEECH_MODELS,
+    "video": FAKE_NEWS_MODELS + HATESPEECH_MODELS + ["whisper"],
+    "batch": FAKE_NEWS_MODELS + HATESPEECH_MODELS,
+}
+ROUTE_ENDPOINTS = {
+    "analyze_text": "text",
+    "analyze_image": "image",
+    "analyze_video": "video",
+    "analyze_video_stream": "video",
+    "submit_video_job": "video",
+    "submit_image_job": "image",
+    "analyze_batch": "batch",
+}
+
+# e.g. FACTIFY_ROUTES=text,batch for a text-only worker ("all" by default)
+_routes_env = os.getenv("FACTIFY_ROUTES", "all")
+ENABLED_ROUTES = set(ROUTE_MODELS) if _routes_env == "all" else {
+    r.strip() for r in _routes_env.split(",") if r.strip()
+}
+
+
+@app.before_request
+def reject_disabled_routes():
+    group = ROUTE_ENDPOINTS.get(request.endpoint)
+    if group and group not in ENABLED_ROUTES:
+        return jsonify({"error": f"Route group '{group}' is not served by this worker"}), 404
+
+
+@app.route("/models", methods=["GET"])
+def model_status():
+    """Which models are loaded in this worker and how long each took to load"""
+    return jsonify({"enabled_routes": sorted(ENABLED_ROUTES), "models": registry.status()}), 200
+
+
+@app.route("/cache/stats", methods=["GET"])
+def result_cache_stats():
+    """Hit/miss counters for the prediction result caches"""
+    return jsonify({**cache_stats(), "articles": article_cache.stats(), "media": media_cache.stats()}), 200
+
+
+def warm_up_models():
+    """MODEL_WARMUP: comma-separated model names, "all", or "routes" (models of ENABLED_ROUTES)"""
+    names = [n.strip() for n in MODEL_WARMUP.split(",") if n.strip()]
+    if "routes" in names:
+        names.remove("routes")
+        for group in ENABLED_ROUTES:
+            names += [m for m in ROUTE_MODELS.get(group, []) if m not in names]
+    if names:
+        print("Warming up models:", ", ".join(names))
+        registry.warm_up(names)
+
+
+warm_up_models()
+
 # ----------------------
 # Error handlers
 # ----------------------
+@app.errorhandler(RequestEntityTooLarge)
+@app.errorhandler(UploadTooLarge)
+def handle_too_large(e):
+    return jsonify({"error": f"Upload too large (max {MAX_UPLOAD_BYTES} bytes)"}), 413
+
 @app.errorhandler(Exception)
 def handle_exception(e):
     tb = traceback.format_exc()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+# Whisper expects 16 kHz mono float32
+SAMPLE_RATE = 16000
+_BYTES_PER_SAMPLE = 4
+
+
+def ffmpeg_binary():
+    """System ffmpeg, else the one bundled with imageio-ffmpeg (a moviepy dependency)"""
+    exe = os.getenv("FFMPEG_BINARY") or shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        raise RuntimeError("ffmpeg not found (install ffmpeg or set FFMPEG_BINARY)")
+
+
+def _ffmpeg_cmd(path, sr, start=None, max_seconds=None):
+    cmd = [ffmpeg_binary(), "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0"]
+    if start:
+        cmd += ["-ss", str(start)]
+    cmd += ["-i", path]
+    if max_seconds:
+        cmd += ["-t", str(max_seconds)]
+    # audio only: ffmpeg skips decoding the video stream entirely
+    cmd += ["-vn", "-sn", "-dn", "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(sr), "-"]
+    return cmd
+
+
+def load_audio(path, sr=SAMPLE_RATE, start=None, max_seconds=None):
+    """
+    Decode the audio track of any media file straight into memory as a
+    mono float32 NumPy array at `sr` Hz (no temp WAV on disk).
+    """
+    proc = subprocess.run(_ffmpeg_cmd(path, sr, start, max_seconds), capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode('utf-8', errors='replace').strip()}")
+    audio = np.frombuffer(proc.stdout, np.float32)
+    if audio.size == 0:
+        raise RuntimeError("Video has no audio track.")
+    return audio
+
+
+def iter_audio_chunks(path, chunk_seconds, sr=SAMPLE_RATE):
+    """Stream decoded audio in fixed-size float32 chunks while ffmpeg is still decoding"""
+    chunk_bytes = int(chunk_seconds * sr) * _BYTES_PER_SAMPLE
+    proc = subprocess.Popen(_ffmpeg_cmd(path, sr), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = proc.stdout.read(chunk_bytes)
+            if not data:
+                break
+            usable = len(data) - len(data) % _BYTES_PER_SAMPLE
+            yield np.frombuffer(data[:usable], np.float32)
+        proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {proc.stderr.read().decode('utf-8', errors='replace').strip()}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.stderr.close()
@@ -0,0 +1,57 @@
+# Compare audio extraction paths on real videos (long ones show the gap best).
+#
+#   cd backend
+#   python -m benchmarks.bench_audio video1.mp4 [video2.mp4 ...] [--repeat N]
+#
+# old:  moviepy -> PCM WAV on disk -> whisper.load_audio (ffmpeg re-reads + resamples)
+# new:  one ffmpeg pipe -> 16 kHz mono float32 NumPy buffer
+import os
+import sys
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio import load_audio, SAMPLE_RATE
+from inference.parity import time_ms
+
+
+def moviepy_wav_path(video_path):
+    from moviepy.editor import VideoFileClip
+    import whisper
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = os.path.join(tmpdir, "audio.wav")
+        clip = VideoFileClip(video_path)
+        clip.audio.write_audiofile(wav_path, fps=SAMPLE_RATE, nbytes=2, codec="pcm_s16le", logger=None)
+        clip.close()
+        wav_bytes = os.path.getsize(wav_path)
+        audio = whisper.load_audio(wav_path)
+    return audio, wav_bytes
+
+
+def ffmpeg_pipe_path(video_path):
+    return load_audio(video_path), 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'video':<32}{'audio s':>9}{'moviepy+wav s':>15}{'disk MB':>9}{'ffmpeg pipe s':>15}{'speedup':>9}{'max diff':>10}")
+    for video in args.videos:
+        old_ms, (old_audio, wav_bytes) = time_ms(lambda: moviepy_wav_path(video), args.repeat)
+        new_ms, (new_audio, _) = time_ms(lambda: ffmpeg_pipe_path(video), args.repeat)
+        old_t, new_t = old_ms / 1000, new_ms / 1000
+        n = min(len(old_audio), len(new_audio))
+        max_diff = float(np.max(np.abs(old_audio[:n] - new_audio[:n]))) if n else float("nan")
+        print(f"{os.path.basename(video)[:31]:<32}{len(new_audio) / SAMPLE_RATE:>9.1f}{old_t:>15.2f}"
+              f"{wav_bytes / 1e6:>9.1f}{new_t:>15.2f}{old_t / new_t:>8.1f}x{max_diff:>10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
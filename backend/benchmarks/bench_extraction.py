@@ -0,0 +1,66 @@
+# Benchmark HTML text extraction engines against the original BeautifulSoup logic.
+#
+#   cd backend
+#   python -m benchmarks.bench_extraction [html_dir] [--repeat N]
+#
+# html_dir defaults to benchmarks/fixtures/html (saved pages, one per .html file).
+import os
+import sys
+import argparse
+import statistics
+from difflib import SequenceMatcher
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from extraction import extract_paragraph_text, available_engines, ARTICLE_MAX_CHARS
+from inference.parity import time_ms
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def baseline(html):
+    """The original extract_article_text parsing step"""
+    soup = BeautifulSoup(html, "html.parser")
+    text = " ".join([p.get_text() for p in soup.find_all("p")])
+    return text[:ARTICLE_MAX_CHARS]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("html_dir", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = {}
+    for name in sorted(os.listdir(args.html_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(args.html_dir, name), encoding="utf-8", errors="replace") as f:
+                pages[name] = f.read()
+    if not pages:
+        print("No .html files in", args.html_dir)
+        return 1
+
+    variants = [("baseline", None, None)]
+    for engine in available_engines():
+        variants += [(f"{engine}", engine, False), (f"{engine}+boilerplate", engine, True)]
+
+    print(f"{len(pages)} pages, median of {args.repeat} runs\n")
+    print(f"{'variant':<24}{'total ms':>10}{'exact':>8}{'similarity':>12}")
+    for label, engine, drop in variants:
+        total, exact, similarity = 0.0, 0, []
+        for name, html in pages.items():
+            expected = baseline(html)
+            if engine is None:
+                ms, out = time_ms(lambda: baseline(html), args.repeat)
+            else:
+                ms, out = time_ms(lambda: extract_paragraph_text(html, engine=engine, drop_boilerplate=drop), args.repeat)
+            total += ms
+            exact += out == expected
+            similarity.append(SequenceMatcher(None, out, expected).ratio())
+        print(f"{label:<24}{total:>10.2f}{exact:>5}/{len(pages):<2}{statistics.mean(similarity):>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
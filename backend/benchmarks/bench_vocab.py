@@ -0,0 +1,77 @@
+# Compare CNN/LSTM/BiLSTM vectorization: Keras Tokenizer vs the compiled vocabulary.
+#
+#   cd backend
+#   python -m benchmarks.bench_vocab [corpus.txt] [--batch N] [--repeat N]
+#
+# corpus.txt has one text per line; defaults to the paragraphs of the saved
+# pages in benchmarks/fixtures/html. Uses the real tokenizers from models/.
+import os
+import re
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from inference.predict import KERAS_SEQUENCE_SPECS
+from inference.parity import time_ms
+from inference.registry import registry
+from inference.vocab import CompiledVocab
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def fixture_corpus():
+    texts = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        texts += [re.sub(r"<[^>]+>", " ", p) for p in re.findall(r"<p[^>]*>(.*?)</p>", html, re.S)]
+    return [t for t in texts if t.strip()]
+
+
+def keras_vectorize(tokenizers, texts):
+    """What predict.py did before: texts_to_sequences + pad_sequences per tokenizer"""
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    return {
+        name: pad_sequences(tok.texts_to_sequences(texts), **KERAS_SEQUENCE_SPECS[name])
+        for name, tok in tokenizers.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?")
+    parser.add_argument("--batch", type=int, default=256, help="texts per call (corpus is repeated to fill it)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = fixture_corpus()
+    texts = (texts * (args.batch // max(len(texts), 1) + 1))[: args.batch]
+
+    tokenizers = {name: registry.get(f"{name}_tokenizer") for name in KERAS_SEQUENCE_SPECS}
+    start = time.perf_counter()
+    vocab = CompiledVocab(tokenizers, KERAS_SEQUENCE_SPECS)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    keras_ms, expected = time_ms(lambda: keras_vectorize(tokenizers, texts), args.repeat)
+    vocab_ms, got = time_ms(lambda: vocab.vectorize(texts), args.repeat)
+
+    print(f"{len(texts)} texts, {len(vocab.word_rows)} words in the merged vocabulary "
+          f"(built once in {build_ms:.0f} ms), median of {args.repeat} runs\n")
+    print(f"{'variant':<28}{'ms':>10}")
+    print(f"{'keras x3 tokenizers':<28}{keras_ms:>10.2f}")
+    print(f"{'compiled vocab (one pass)':<28}{vocab_ms:>10.2f}   {keras_ms / max(vocab_ms, 1e-9):.1f}x")
+    for name in KERAS_SEQUENCE_SPECS:
+        same = np.array_equal(expected[name], got[name])
+        print(f"  {name:<8} identical to Keras: {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Check that the fast (Rust) tokenizers give the same input ids as the slow
+# Python ones the models were served with before, and time both.
+#
+#   cd backend
+#   python -m benchmarks.verify_tokenizers [corpus.txt] [--repeat N]
+#
+# corpus.txt has one text per line; defaults to benchmarks/fixtures/text/tokenizer_corpus.txt
+# plus the paragraphs of the saved pages in benchmarks/fixtures/html.
+# Exits with status 1 if any text tokenizes differently.
+import os
+import sys
+import argparse
+
+from transformers import DistilBertTokenizer, DistilBertTokenizerFast, RobertaTokenizer, RobertaTokenizerFast
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from inference.predict import distilbert_path, roberta_path
+from benchmarks.bench_vocab import fixture_corpus
+from inference.parity import time_ms
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "text", "tokenizer_corpus.txt")
+
+TOKENIZERS = {
+    "distilbert": (DistilBertTokenizer, DistilBertTokenizerFast, distilbert_path),
+    "roberta": (RobertaTokenizer, RobertaTokenizerFast, roberta_path),
+}
+
+
+def read_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = read_corpus(args.corpus) if args.corpus else read_corpus(CORPUS_PATH) + fixture_corpus()
+    print(f"{len(texts)} texts, median of {args.repeat} runs\n")
+
+    failed = False
+    for name, (slow_cls, fast_cls, path) in TOKENIZERS.items():
+        slow = slow_cls.from_pretrained(path, local_files_only=True)
+        fast = fast_cls.from_pretrained(path, local_files_only=True)
+
+        # Same call shape as predict.encode_texts: untruncated, no special tokens
+        def encode(tok):
+            return tok(texts, add_special_tokens=False, truncation=False,
+                       return_attention_mask=False, verbose=False)["input_ids"]
+
+        slow_ms, slow_ids = time_ms(lambda: encode(slow), args.repeat)
+        fast_ms, fast_ids = time_ms(lambda: encode(fast), args.repeat)
+        mismatches = [i for i, (a, b) in enumerate(zip(slow_ids, fast_ids)) if a != b]
+        specials_match = all(
+            slow.build_inputs_with_special_tokens(ids) == fast.build_inputs_with_special_tokens(ids)
+            for ids in slow_ids
+        )
+
+        print(f"{name:<12} slow {slow_ms:8.2f} ms   fast {fast_ms:8.2f} ms   "
+              f"{slow_ms / max(fast_ms, 1e-9):.1f}x   mismatches: {len(mismatches)}   "
+              f"special tokens match: {specials_match}")
+        for i in mismatches[:5]:
+            print(f"  text {i}: {texts[i][:60]!r}\n    slow {slow_ids[i][:20]}\n    fast {fast_ids[i][:20]}")
+        failed |= bool(mismatches) or not specials_match
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# ----------------------
+# Config
+# ----------------------
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))  # max concurrent Chrome sessions
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))  # recycle a session after N pages
+BROWSER_PAGE_TIMEOUT = int(os.getenv("BROWSER_PAGE_TIMEOUT", "15"))  # seconds per page load
+BROWSER_ACQUIRE_TIMEOUT = int(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "30"))  # seconds to wait for a free session
+
+
+def _chrome_options():
+    options = Options()
+    options.add_argument("--headless=new")  # no browser window
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--log-level=3")
+    return options
+
+
+class BrowserPool:
+    """
+    Bounded pool of reusable headless Chrome sessions.
+    Sessions start lazily, are health-checked before reuse and are
+    recycled after `max_pages` page loads or any WebDriver error.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES,
+                 page_timeout=BROWSER_PAGE_TIMEOUT, acquire_timeout=BROWSER_ACQUIRE_TIMEOUT):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.LifoQueue()  # most recently used first: warm caches
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self):
+        driver = webdriver.Chrome(options=_chrome_options())
+        driver.set_page_load_timeout(self.page_timeout)
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _quit(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError("No browser session available")
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._start()
+                if self._healthy(driver):
+                    return driver
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, healthy=True):
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0)
+            if self._closed or not healthy or pages >= self.max_pages:
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def get_page_source(self, url):
+        """Load `url` in a pooled session; on timeout, stop loading and return what rendered"""
+        with self.session() as driver:
+            with self._lock:
+                self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            try:
+                driver.get(url)
+            except TimeoutException:
+                driver.execute_script("window.stop();")
+            return driver.page_source
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self):
+        with self._lock:
+            return {"size": self.size, "open_sessions": len(self._pages), "idle": self._idle.qsize()}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
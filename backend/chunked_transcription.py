@@ -0,0 +1,168 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from audio import SAMPLE_RATE, iter_audio_chunks
+
+# ----------------------
+# Config
+# ----------------------
+CHUNK_MAX_SECONDS = float(os.getenv("CHUNK_MAX_SECONDS", "30"))  # Whisper's native window
+TRANSCRIBE_PROCESSES = int(os.getenv("TRANSCRIBE_PROCESSES", "2"))  # 0 = transcribe in-process
+VAD_FRAME_MS = 30
+VAD_MIN_DB = float(os.getenv("VAD_MIN_DB", "-50"))  # frames quieter than this are always silence
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "10"))  # speech = this far above the noise floor
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "500"))
+VAD_MIN_SPEECH_MS = 250
+VAD_PAD_MS = 200
+
+
+# ----------------------
+# Voice activity detection
+# ----------------------
+def detect_speech_segments(audio, sr=SAMPLE_RATE):
+    """
+    Energy-based VAD: [(start_sample, end_sample)] of speech regions.
+    The threshold adapts to the clip's noise floor (10th percentile frame energy).
+    Audio that is not silent but has no quieter stretches to measure a floor
+    against (music, steady speech) comes back as one segment.
+    """
+    frame = int(sr * VAD_FRAME_MS / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    db = 10 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+    threshold = max(np.percentile(db, 10) + VAD_MARGIN_DB, VAD_MIN_DB)
+    speech = db > threshold
+    if not speech.any():
+        return [(0, len(audio))] if db.max() > VAD_MIN_DB else []
+
+    # Runs of speech frames
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    runs = list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+    # Bridge short pauses, drop short blips, pad the rest
+    min_gap = VAD_MIN_SILENCE_MS // VAD_FRAME_MS
+    merged = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    min_len = VAD_MIN_SPEECH_MS // VAD_FRAME_MS
+    pad = int(sr * VAD_PAD_MS / 1000)
+    return [
+        (max(0, start * frame - pad), min(len(audio), end * frame + pad))
+        for start, end in merged if end - start >= min_len
+    ]
+
+
+def plan_chunks(segments, sr=SAMPLE_RATE, max_seconds=CHUNK_MAX_SECONDS):
+    """Pack consecutive speech segments into chunks of at most max_seconds, cutting at pauses"""
+    max_len = int(max_seconds * sr)
+    chunks = []
+    for start, end in segments:
+        # A single segment longer than the window gets hard-split
+        while end - start > max_len:
+            chunks.append((start, start + max_len))
+            start += max_len
+        if chunks and end - chunks[-1][0] <= max_len and start >= chunks[-1][1]:
+            chunks[-1] = (chunks[-1][0], end)
+        else:
+            chunks.append((start, end))
+    return chunks
+
+
+# ----------------------
+# Worker processes
+# ----------------------
+def _transcribe_chunk(audio):
+    # Runs in a worker process: each worker keeps its own warm model
+    from transcription import transcribe
+    return transcribe(audio)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_transcribe_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a process that already holds torch/TF thread pools
+            _pool = ProcessPoolExecutor(max_workers=TRANSCRIBE_PROCESSES,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def iter_planned_chunks(blocks, sr=SAMPLE_RATE):
+    """
+    (start, end, samples) per chunk from audio arriving in blocks. Each block is
+    appended to a buffer and split; every chunk but the last (which may still
+    grow into the next block) is final and leaves the buffer.
+    """
+    buffer = np.zeros(0, dtype=np.float32)
+    offset = 0  # absolute sample index of buffer[0]
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        chunks = plan_chunks(detect_speech_segments(buffer, sr), sr)
+        for start, end in chunks[:-1]:
+            yield offset + start, offset + end, buffer[start:end]
+        keep = chunks[-1][0] if chunks else len(buffer)
+        buffer = buffer[keep:]
+        offset += keep
+    for start, end in plan_chunks(detect_speech_segments(buffer, sr), sr):
+        yield offset + start, offset + end, buffer[start:end]
+
+
+def iter_transcript_chunks(audio, sr=SAMPLE_RATE):
+    """
+    Yield {"index", "start", "end", "text"} per chunk, in order, as soon as
+    each chunk and all chunks before it are transcribed. Silence is skipped.
+    `audio` is a media file path (decoded as it streams, so the first chunk is
+    transcribed before the whole file is decoded) or a 16 kHz array.
+    """
+    blocks = iter_audio_chunks(audio, CHUNK_MAX_SECONDS, sr) if isinstance(audio, str) else [audio]
+    spans = []
+
+    def event(i, text):
+        start, end = spans[i]
+        return {"index": i, "start": round(start / sr, 2), "end": round(end / sr, 2), "text": text.strip()}
+
+    if TRANSCRIBE_PROCESSES <= 0:
+        from transcription import transcribe
+        for i, (start, end, samples) in enumerate(iter_planned_chunks(blocks, sr)):
+            spans.append((start, end))
+            yield event(i, transcribe(samples))
+        return
+
+    pool = get_transcribe_pool()
+    pending = {}
+    done_texts = {}
+    next_index = 0
+
+    def collect(timeout):
+        nonlocal next_index
+        finished, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in finished:
+            done_texts[pending.pop(fut)] = fut.result()
+        while next_index in done_texts:
+            yield event(next_index, done_texts.pop(next_index))
+            next_index += 1
+
+    try:
+        for i, (start, end, samples) in enumerate(iter_planned_chunks(blocks, sr)):
+            spans.append((start, end))
+            pending[pool.submit(_transcribe_chunk, samples)] = i
+            yield from collect(timeout=0)
+        while pending:
+            yield from collect(timeout=None)
+    finally:
+        for fut in pending:
+            fut.cancel()
@@ -0,0 +1,195 @@
+import os
+import re
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:  # selectolax < 0.3.13 only ships the Modest backend
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+from bs4 import BeautifulSoup
+
+# ----------------------
+# Config
+# ----------------------
+# "auto" (selectolax > lxml > bs4), or force one of "lxml", "selectolax", "bs4"
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto").lower()
+EXTRACT_DROP_BOILERPLATE = os.getenv("EXTRACT_DROP_BOILERPLATE", "1") == "1"
+ARTICLE_MAX_CHARS = 1200
+
+# <p> inside these never belongs to the article body
+BOILERPLATE_TAGS = {"nav", "footer", "aside", "form", "noscript", "template"}
+# <header> only counts as boilerplate outside <article>/<main> (inside, it holds the lede)
+CONTENT_TAGS = {"article", "main"}
+# never dropped, whatever their class/id ("has-sidebar cookies-not-set" is a common <body> class);
+# an element that contains <article>/<main> is never dropped either
+PROTECTED_TAGS = {"html", "body"} | CONTENT_TAGS
+CONTENT_SELECTOR = ", ".join(sorted(CONTENT_TAGS))
+# text of these is never visible (bs4 get_text skips them too)
+SKIP_TEXT_TAGS = {"script", "style"}
+BOILERPLATE_ATTR = re.compile(
+    r"cookie|consent|newsletter|subscribe|signup|promo|related-|share-|social|advert|sidebar|comments", re.I
+)
+
+_FEED_CHUNK = 64 * 1024
+
+
+def _is_boilerplate(tag, attrs, inside_content):
+    if tag in PROTECTED_TAGS:
+        return False
+    if tag in BOILERPLATE_TAGS or (tag == "header" and not inside_content):
+        return True
+    marker = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+    return bool(marker.strip()) and bool(BOILERPLATE_ATTR.search(marker))
+
+
+class _Budget:
+    """Joins paragraph texts with " " and reports when max_chars is reached"""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = -1  # no leading separator
+
+    def add(self, text):
+        self.parts.append(text)
+        self.length += len(text) + 1
+        return self.full
+
+    @property
+    def full(self):
+        return self.max_chars is not None and self.length >= self.max_chars
+
+    def result(self):
+        text = " ".join(self.parts)
+        return text[: self.max_chars] if self.max_chars is not None else text
+
+
+# ----------------------
+# Engines
+# ----------------------
+def _lxml_text(el):
+    """Like bs4 get_text(): element + descendant text, skipping comments and script/style"""
+    parts = [el.text or ""]
+    for child in el:
+        if isinstance(child.tag, str) and child.tag.lower() not in SKIP_TEXT_TAGS:
+            parts.append(_lxml_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _extract_lxml(html, max_chars, drop_boilerplate):
+    """
+    Streaming pull parse: stops feeding the document once the character budget is met.
+    Paragraphs inside a boilerplate subtree are held back until it closes: they are
+    dropped then, or kept as soon as an <article>/<main> opens inside it.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    budget = _Budget(max_chars)
+    boiler_depth = 0  # open boilerplate subtrees
+    content_depth = 0
+    pending = []  # paragraph texts inside open boilerplate subtrees
+    stack = []  # [tag, boiler, len(pending) at start]
+
+    for start in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[start:start + _FEED_CHUNK])
+        for event, el in parser.read_events():
+            tag = el.tag.lower() if isinstance(el.tag, str) else ""
+            if event == "start":
+                if tag in CONTENT_TAGS:
+                    content_depth += 1
+                    if boiler_depth:  # every open boilerplate subtree is an ancestor: keep them
+                        for frame in stack:
+                            frame[1] = False
+                        boiler_depth = 0
+                        for text in pending:
+                            if budget.add(text):
+                                return budget.result()
+                        pending = []
+                boiler = drop_boilerplate and _is_boilerplate(tag, el.attrib, content_depth > 0)
+                stack.append([tag, boiler, len(pending)])
+                boiler_depth += boiler
+                continue
+            if not stack:
+                continue
+            if tag == "p":
+                text = _lxml_text(el)
+                if boiler_depth:
+                    pending.append(text)
+                elif budget.add(text):
+                    return budget.result()
+            _, boiler, mark = stack.pop()
+            if boiler:
+                boiler_depth -= 1
+                del pending[mark:]
+            content_depth -= tag in CONTENT_TAGS
+    parser.close()
+    return budget.result()
+
+
+def _extract_selectolax(html, max_chars, drop_boilerplate):
+    tree = SelectolaxParser(html)
+    for node in tree.css("script, style"):
+        node.decompose()
+    if drop_boilerplate:
+        candidates = tree.css(", ".join(sorted(BOILERPLATE_TAGS | {"header", "[class]", "[id]"})))
+        for node in reversed(candidates):  # innermost first, so no node is visited after its ancestor is gone
+            inside = False
+            if node.tag == "header":
+                parent = node.parent
+                while parent is not None and not inside:
+                    inside = parent.tag in CONTENT_TAGS
+                    parent = parent.parent
+            if _is_boilerplate(node.tag, node.attributes, inside) and node.css_first(CONTENT_SELECTOR) is None:
+                node.decompose()
+    budget = _Budget(max_chars)
+    for p in tree.css("p"):
+        if budget.add(p.text(deep=True)):
+            break
+    return budget.result()
+
+
+def _extract_bs4(html, max_chars, drop_boilerplate):
+    soup = BeautifulSoup(html, "html.parser")
+    if drop_boilerplate:
+        for el in reversed(soup.find_all(True)):  # innermost first, like the selectolax engine
+            classes = el.get("class") or []
+            attrs = {"class": " ".join(classes) if isinstance(classes, list) else classes, "id": el.get("id")}
+            inside = el.name == "header" and el.find_parent(list(CONTENT_TAGS)) is not None
+            if _is_boilerplate(el.name, attrs, inside) and el.find(list(CONTENT_TAGS)) is None:
+                el.decompose()
+    budget = _Budget(max_chars)
+    for p in soup.find_all("p"):
+        if budget.add(p.get_text()):
+            break
+    return budget.result()
+
+
+ENGINES = {"lxml": _extract_lxml, "selectolax": _extract_selectolax, "bs4": _extract_bs4}
+
+
+def available_engines():
+    """Installed engines, fastest first"""
+    return [name for name, mod in (("selectolax", SelectolaxParser), ("lxml", etree), ("bs4", BeautifulSoup)) if mod]
+
+
+def extract_paragraph_text(html, max_chars=ARTICLE_MAX_CHARS, engine=None, drop_boilerplate=None):
+    """
+    Space-joined text of the page's <p> elements, cut to max_chars
+    (same shape as the original BeautifulSoup extraction).
+    """
+    if not html:
+        return ""
+    engine = engine or HTML_EXTRACTOR
+    if engine == "auto" or engine not in available_engines():
+        engine = available_engines()[0]
+    if drop_boilerplate is None:
+        drop_boilerplate = EXTRACT_DROP_BOILERPLATE
+    return ENGINES[engine](html, max_chars, drop_boilerplate)
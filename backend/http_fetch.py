@@ -0,0 +1,170 @@
+import os
+import asyncio
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from inference.cache import LRUCache
+
+try:
+    import httpx  # optional: HTTP/2 and the native asyncio client
+except ImportError:
+    httpx = None
+
+# ----------------------
+# Config
+# ----------------------
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "8"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))  # keep-alive connections kept per host
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))  # concurrent requests per host
+HTTP_USE_HTTP2 = os.getenv("HTTP_USE_HTTP2", "0") == "1" and httpx is not None
+HTTP_VALIDATOR_CACHE_SIZE = int(os.getenv("HTTP_VALIDATOR_CACHE_SIZE", "2000"))
+HTTP_VALIDATOR_CACHE_MB = float(os.getenv("HTTP_VALIDATOR_CACHE_MB", "32"))  # bodies kept for 304 replies
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# url -> {"etag", "last_modified", "text"} for conditional GETs, bounded by entries and body size
+_validators = LRUCache(
+    HTTP_VALIDATOR_CACHE_SIZE,
+    max_bytes=int(HTTP_VALIDATOR_CACHE_MB * 1024 * 1024),
+    sizeof=lambda entry: len(entry["text"]),
+)
+
+_session = None
+_http2_client = None
+_client_lock = threading.Lock()
+_host_slots = {}  # host -> [semaphore, requests holding or waiting]; dropped when idle
+_host_lock = threading.Lock()
+
+
+# ----------------------
+# Shared clients
+# ----------------------
+def get_session():
+    """Process-wide keep-alive session (connection pooling + small retry budget)"""
+    global _session
+    with _client_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def _get_http2_client():
+    global _http2_client
+    with _client_lock:
+        if _http2_client is None:
+            limits = httpx.Limits(max_keepalive_connections=HTTP_POOL_SIZE, max_connections=HTTP_POOL_SIZE * 4)
+            _http2_client = httpx.Client(http2=True, limits=limits, headers=DEFAULT_HEADERS, follow_redirects=True)
+        return _http2_client
+
+
+@contextmanager
+def _host_slot(url):
+    host = urlsplit(url).netloc.lower()
+    with _host_lock:
+        entry = _host_slots.setdefault(host, [threading.BoundedSemaphore(HTTP_PER_HOST_LIMIT), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _host_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _host_slots[host]
+
+
+# ----------------------
+# Conditional GET helpers
+# ----------------------
+def _conditional_headers(url):
+    entry = _validators.get(url)
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _handle_response(url, status_code, headers, get_text):
+    """
+    304 -> previously fetched body, or None if it was evicted since the request
+    went out (the caller re-fetches unconditionally); otherwise remember
+    validators and return the new body.
+    """
+    if status_code == 304:
+        entry = _validators.get(url)
+        return entry["text"] if entry else None
+    text = get_text()
+    etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+    if status_code == 200 and (etag or last_modified):
+        _validators.set(url, {"etag": etag, "last_modified": last_modified, "text": text})
+    return text
+
+
+# ----------------------
+# Fetchers
+# ----------------------
+def _get(url, timeout, headers):
+    with _host_slot(url):
+        if HTTP_USE_HTTP2:
+            return _get_http2_client().get(url, timeout=timeout, headers=headers)
+        return get_session().get(url, timeout=timeout, headers=headers)
+
+
+def fetch_text(url, timeout=HTTP_TIMEOUT):
+    """GET `url` through the shared pool and return the body text"""
+    resp = _get(url, timeout, _conditional_headers(url))
+    text = _handle_response(url, resp.status_code, resp.headers, lambda: resp.text)
+    if text is None:
+        resp = _get(url, timeout, {})
+        text = _handle_response(url, resp.status_code, resp.headers, lambda: resp.text)
+    return text or ""
+
+
+async def _fetch_text_async(client, url, slots, timeout):
+    host = urlsplit(url).netloc.lower()
+    slot = slots.setdefault(host, asyncio.Semaphore(HTTP_PER_HOST_LIMIT))
+    async with slot:
+        if client is None:  # no httpx: run the pooled sync fetcher in a thread
+            return await asyncio.to_thread(fetch_text, url, timeout)
+        resp = await client.get(url, timeout=timeout, headers=_conditional_headers(url))
+        text = _handle_response(url, resp.status_code, resp.headers, lambda: resp.text)
+        if text is None:  # 304, but the cached body was evicted meanwhile
+            resp = await client.get(url, timeout=timeout)
+            text = _handle_response(url, resp.status_code, resp.headers, lambda: resp.text)
+    return text or ""
+
+
+async def fetch_many_async(urls, timeout=HTTP_TIMEOUT):
+    """
+    Fetch many URLs concurrently (per-host limit applies).
+    Returns bodies in input order; failed fetches come back as the exception.
+    """
+    slots = {}
+    if httpx is None:
+        return await asyncio.gather(*(_fetch_text_async(None, u, slots, timeout) for u in urls), return_exceptions=True)
+
+    limits = httpx.Limits(max_keepalive_connections=HTTP_POOL_SIZE, max_connections=HTTP_POOL_SIZE * 4)
+    async with httpx.AsyncClient(http2=HTTP_USE_HTTP2, limits=limits, headers=DEFAULT_HEADERS,
+                                 follow_redirects=True) as client:
+        return await asyncio.gather(*(_fetch_text_async(client, u, slots, timeout) for u in urls),
+                                    return_exceptions=True)
+
+
+def fetch_many(urls, timeout=HTTP_TIMEOUT):
+    """Blocking wrapper around fetch_many_async for batch scripts"""
+    return asyncio.run(fetch_many_async(urls, timeout))
@@ -0,0 +1,124 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# ----------------------------
+# Config
+# ----------------------------
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+
+# ----------------------------
+# Micro-batching scheduler
+# ----------------------------
+class MicroBatcher:
+    """
+    Collects concurrent single-item requests for up to `max_wait_ms`
+    (or until `max_batch_size` items are queued), runs `batch_fn` once on
+    the whole list and hands each caller its own result.
+
+    `batch_fn(items)` must return a list of results aligned with `items`.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS, name="batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._closed = False
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolved when its batch is done."""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        future = Future()
+        self._queue.put((item, future))
+        self._ensure_worker()
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                self._queue.put(None)  # re-post shutdown marker for the outer loop
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            # Skip callers that gave up / were cancelled before we started
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+
+# ----------------------------
+# Fake-news ensemble batcher
+# ----------------------------
+_ensemble_batchers = {}  # long-text strategy -> batcher (one forward pass can't mix strategies)
+_ensemble_lock = threading.Lock()
+
+
+def _run_ensemble_batch(texts, strategy=None):
+    from inference.predict import predict_batch
+
+    return predict_batch(texts, strategy=strategy)
+
+
+def get_ensemble_batcher(strategy=None):
+    with _ensemble_lock:
+        if strategy not in _ensemble_batchers:
+            _ensemble_batchers[strategy] = MicroBatcher(
+                lambda texts: _run_ensemble_batch(texts, strategy), name="ensemble-batcher"
+            )
+        return _ensemble_batchers[strategy]
+
+
+def predict_with_batching(text, timeout=None, strategy=None):
+    """Drop-in for predict_with_max_voting(text, vectorize_text(text), strategy=strategy)."""
+    return get_ensemble_batcher(strategy)(text, timeout=timeout)
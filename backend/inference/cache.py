@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+# ----------------------------
+# Keys
+# ----------------------------
+def normalize_text(text):
+    """NFKC + collapsed whitespace, so trivially different copies share a key"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+def text_key(text, version=""):
+    return hashlib.sha256(f"{version}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def files_version(paths, extra=""):
+    """Cheap model version: size + mtime of each model file (missing files are skipped)"""
+    h = hashlib.sha256(extra.encode("utf-8"))
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, f) for f in os.listdir(path))
+        else:
+            files = [path]
+        for f in files:
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            h.update(f"{os.path.basename(f)}:{st.st_size}:{int(st.st_mtime)}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# ----------------------------
+# Tiers
+# ----------------------------
+class LRUCache:
+    """
+    Thread-safe in-process LRU with optional TTL. With max_bytes and sizeof it
+    is also bounded by the summed sizeof(value) of its entries.
+    """
+
+    def __init__(self, max_entries=10000, ttl=None, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value, size = entry
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                self.bytes -= size
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        expires = time.time() + self.ttl if self.ttl else None
+        size = self.sizeof(value) if self.max_bytes and self.sizeof else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (expires, value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+                self.bytes -= self._data.popitem(last=False)[1][2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    On-disk JSON cache shared across worker processes, with TTL and max-entries
+    eviction. Eviction runs every `evict_every` writes, not on each one, and
+    trims to 90% of max_entries so the next pass has headroom.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=100000, table="cache", evict_every=256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.table = table
+        self.evict_every = evict_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_expires ON {table}(expires)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            with self._conn:
+                if expires is not None and expires < now:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    return None
+                self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires, now),
+            )
+            self._writes += 1
+            if self._writes >= self.evict_every:
+                self._writes = 0
+                self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires IS NOT NULL AND expires < ?", (now,))
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed ASC LIMIT ?)",
+                (count - int(self.max_entries * 0.9),),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional SQLite tier.
+    Disk hits are promoted to memory. Hit/miss counters via stats().
+    """
+
+    def __init__(self, name, memory_entries=10000, disk_path=None, ttl=None, disk_max_entries=100000):
+        self.name = name
+        self.memory = LRUCache(memory_entries, ttl)
+        self.disk = SQLiteCache(disk_path, ttl, disk_max_entries, table=name) if disk_path else None
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.memory.max_entries > 0 or self.disk is not None
+
+    def _count(self, field):
+        with self._lock:
+            self._counts[field] += 1
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except Exception as e:
+                print(f"{self.name} cache read failed:", e)
+                value = None
+            if value is not None:
+                self._count("disk_hits")
+                self.memory.set(key, value)
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key, value):
+        self._count("sets")
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except Exception as e:
+                print(f"{self.name} cache write failed:", e)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+        counts["hit_rate"] = round((lookups - counts["misses"]) / lookups, 4) if lookups else 0.0
+        counts["memory_entries"] = len(self.memory)
+        if self.disk is not None:
+            try:
+                counts["disk_entries"] = len(self.disk)
+            except Exception:
+                counts["disk_entries"] = None
+        return counts
+
+
+def cached_batch(cache, texts, version, compute_fn):
+    """
+    Look every text up in `cache`; run `compute_fn` once on the misses only
+    (list in, list out) and store the new results. Returns results in input order.
+    """
+    texts = list(texts)
+    if cache is None or not cache.enabled:
+        return compute_fn(texts)
+
+    keys = [text_key(t, version) for t in texts]
+    results = [cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        computed = compute_fn([texts[i] for i in missing])
+        for i, value in zip(missing, computed):
+            results[i] = value
+            cache.set(keys[i], value)
+    return results
@@ -1,20 +1,36 @@
 import numpy as np
 import pickle
 import os
-from tensorflow.keras.models import load_model
+from functools import lru_cache
 from inference.hatespeech.preprocessing import preprocess_texts
+from inference.registry import registry
+from inference.cache import files_version
+from inference.tflite_backend import load_keras_model, tflite_model_path, runtime_signature
 
 
 # Paths
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "saved_model", "bilstm_model.h5")
 TOKENIZER_PATH = os.path.join(os.path.dirname(__file__), "saved_model", "tokenizer.pkl")
 
-# Load trained model
-model = load_model(MODEL_PATH)
+HATESPEECH_MODELS = ["hatespeech", "hatespeech_tokenizer"]
+
+# Load trained model (lazily, on first prediction)
+def _load_model():
+    # Keras, tf.function or TFLite depending on KERAS_RUNTIME
+    return load_keras_model("hatespeech", MODEL_PATH)
 
 # Load tokenizer
-with open(TOKENIZER_PATH, "rb") as handle:
-    tokenizer = pickle.load(handle)
+def _load_tokenizer():
+    with open(TOKENIZER_PATH, "rb") as handle:
+        return pickle.load(handle)
+
+registry.register("hatespeech", _load_model)
+registry.register("hatespeech_tokenizer", _load_tokenizer)
+
+@lru_cache(maxsize=None)
+def hatespeech_version():
+    """Result-cache key component; changes when the model/tokenizer file or the Keras runtime changes"""
+    return files_version([MODEL_PATH, TOKENIZER_PATH, tflite_model_path("hatespeech")], extra=runtime_signature())
 
 # Label mapping (adjust if different)
 mapping = {0: "Hate Speech", 1: "Offensive Language", 2: "Neither"}
@@ -23,8 +39,8 @@ def predict_hatespeech(texts):
     """
     Takes list of texts -> returns predictions with label, confidence, and scores.
     """
-    X, _ = preprocess_texts(texts, tokenizer)
-    preds = model.predict(X)
+    X, _ = preprocess_texts(texts, registry.get("hatespeech_tokenizer"))
+    preds = registry.get("hatespeech").predict(X)
 
     results = []
     for i, pred in enumerate(preds):
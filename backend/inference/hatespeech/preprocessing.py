@@ -1,6 +1,4 @@
 import re
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 
 max_words = 10000
 max_len = 100
@@ -12,6 +10,10 @@ def clean_text(text):
     return text.lower()
 
 def preprocess_texts(texts, tokenizer=None):
+    # TensorFlow is imported on first use so importing this module stays cheap
+    from tensorflow.keras.preprocessing.text import Tokenizer
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
     texts = [clean_text(t) for t in texts]
     if tokenizer is None:
         tokenizer = Tokenizer(num_words=max_words, oov_token="<OOV>")
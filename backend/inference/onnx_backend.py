@@ -0,0 +1,145 @@
+"""
+Optional ONNX Runtime backend for the fine-tuned DistilBERT / RoBERTa models.
+
+Export (+ int8 dynamic quantization) and parity check against PyTorch:
+    python -m inference.onnx_backend export distilbert
+    python -m inference.onnx_backend parity roberta
+
+Select per model at runtime with DISTILBERT_BACKEND=onnx / ROBERTA_BACKEND=onnx.
+"""
+import os
+import sys
+import numpy as np
+from scipy.special import softmax
+
+from inference.parity import PARITY_TEXTS, compare_probs
+
+ONNX_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../models/onnx"))
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "1") == "1"
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))  # 0 = let onnxruntime decide
+
+# Probability tolerance for the parity check (int8 drifts more than fp32)
+PARITY_ATOL_FP32 = 1e-3
+PARITY_ATOL_INT8 = 0.05
+
+
+def onnx_model_path(name, quantized=ONNX_QUANTIZED):
+    return os.path.join(ONNX_DIR, f"{name}.int8.onnx" if quantized else f"{name}.onnx")
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def export_to_onnx(tokenizer, model, out_path, opset=14):
+    """Export a *ForSequenceClassification model with dynamic batch/sequence axes."""
+    import torch
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    model = model.to("cpu").eval()
+    sample = tokenizer(["export sample"], return_tensors="pt", padding=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            out_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    return out_path
+
+
+def quantize_onnx(fp32_path, int8_path):
+    """Dynamic int8 quantization of the weights (activations stay fp32)."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+# ----------------------------
+# Runtime
+# ----------------------------
+class OnnxSequenceClassifier:
+    """Thin onnxruntime session wrapper returning logits as a NumPy array."""
+
+    def __init__(self, path, threads=ONNX_THREADS):
+        import onnxruntime as ort
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"ONNX model not found: {path} (run `python -m inference.onnx_backend export`)")
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def logits(self, encoded):
+        feed = {k: np.asarray(encoded[k], dtype=np.int64) for k in self.input_names}
+        return self.session.run(["logits"], feed)[0]
+
+
+def check_parity(tokenizer, torch_model, onnx_model, texts=PARITY_TEXTS, atol=None):
+    """
+    Compare ONNX and PyTorch softmax outputs on `texts`.
+    Returns a report dict; report["ok"] is False if the drift exceeds atol
+    or any predicted label differs.
+    """
+    import torch
+
+    if atol is None:
+        atol = PARITY_ATOL_INT8 if onnx_model.path.endswith(".int8.onnx") else PARITY_ATOL_FP32
+
+    encoded = tokenizer(list(texts), return_tensors="pt", truncation=True, padding=True, max_length=512)
+    with torch.no_grad():
+        torch_logits = torch_model.to("cpu")(**encoded).logits.numpy()
+    onnx_logits = onnx_model.logits({k: v.numpy() for k, v in encoded.items()})
+
+    report = compare_probs(softmax(torch_logits, axis=1), softmax(onnx_logits, axis=1), atol, onnx_model.path)
+    report["max_logit_diff"] = float(np.max(np.abs(torch_logits - onnx_logits)))
+    return report
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+def _torch_model(name):
+    from inference.predict import registry  # registers the PyTorch loaders
+
+    return registry.get(name)
+
+
+def main(argv):
+    if len(argv) != 2 or argv[0] not in ("export", "parity") or argv[1] not in ("distilbert", "roberta"):
+        print("Usage: python -m inference.onnx_backend {export|parity} {distilbert|roberta}")
+        return 2
+    command, name = argv
+    tokenizer, model = _torch_model(name)
+
+    if command == "export":
+        fp32_path = export_to_onnx(tokenizer, model, onnx_model_path(name, quantized=False))
+        print("✅ Exported", fp32_path)
+        int8_path = quantize_onnx(fp32_path, onnx_model_path(name, quantized=True))
+        print("✅ Quantized", int8_path)
+
+    ok = True
+    for quantized in (False, True):
+        path = onnx_model_path(name, quantized=quantized)
+        if not os.path.exists(path):
+            continue
+        report = check_parity(tokenizer, model, OnnxSequenceClassifier(path))
+        print(report)
+        ok = ok and report["ok"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
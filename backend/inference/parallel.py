@@ -0,0 +1,81 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ----------------------------
+# Config
+# ----------------------------
+# PyTorch and TensorFlow kernels release the GIL, so the transformer branch,
+# the Keras branch and hate speech can run side by side in threads. Each
+# framework gets its own share of the cores so they don't oversubscribe.
+PARALLEL_INFERENCE = os.getenv("PARALLEL_INFERENCE", "1") == "1"
+_CORES = os.cpu_count() or 2
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", str(max(1, _CORES // 2))))
+TF_INTRA_OP_THREADS = int(os.getenv("TF_INTRA_OP_THREADS", str(max(1, _CORES - TORCH_THREADS))))
+TF_INTER_OP_THREADS = int(os.getenv("TF_INTER_OP_THREADS", "2"))  # Keras ensemble + hate speech
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "8"))
+
+_configured = set()
+_config_lock = threading.Lock()
+
+
+def configure_torch():
+    """Pin PyTorch's intra-op pool to TORCH_THREADS (once per process)"""
+    with _config_lock:
+        if "torch" in _configured:
+            return
+        _configured.add("torch")
+        import torch
+        torch.set_num_threads(TORCH_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # already started; only settable before the first parallel op
+
+
+def configure_tensorflow():
+    """Set TensorFlow's thread pools; must run before TF executes its first op"""
+    with _config_lock:
+        if "tensorflow" in _configured:
+            return
+        _configured.add("tensorflow")
+        import tensorflow as tf
+        try:
+            tf.config.threading.set_intra_op_parallelism_threads(TF_INTRA_OP_THREADS)
+            tf.config.threading.set_inter_op_parallelism_threads(TF_INTER_OP_THREADS)
+        except RuntimeError as e:
+            print("⚠️ TensorFlow threads already initialized:", e)
+
+
+# ----------------------------
+# Executor
+# ----------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=PARALLEL_WORKERS, thread_name_prefix="model-branch")
+        return _pool
+
+
+def run_parallel(tasks):
+    """
+    Run {name: callable} concurrently and return {name: result}; the first
+    exception is re-raised. The first task runs in the calling thread, so put
+    any task that itself calls run_parallel first: pool threads then only run
+    leaf work and nested calls can't starve the pool.
+    """
+    names = list(tasks)
+    if not PARALLEL_INFERENCE or len(names) < 2:
+        return {name: tasks[name]() for name in names}
+
+    pool = _get_pool()
+    futures = {name: pool.submit(tasks[name]) for name in names[1:]}
+    results = {names[0]: tasks[names[0]]()}
+    for name, future in futures.items():
+        results[name] = future.result()
+    return {name: results[name] for name in names}
@@ -0,0 +1,49 @@
+import time
+import statistics
+
+import numpy as np
+
+# ----------------------------
+# Shared by the optional backends (onnx_backend, tflite_backend), their
+# parity tests and the benchmarks
+# ----------------------------
+PARITY_TEXTS = [
+    "Rahul Gandhi is from the male gender",
+    "NASA confirms the moon landing was staged in a Hollywood studio.",
+    "The central bank raised interest rates by 25 basis points on Wednesday, citing persistent inflation.",
+    "Scientists say drinking bleach cures the virus, according to a viral social media post.",
+    "The city council approved the new budget after a lengthy debate over school funding and road repairs.",
+    "You people are the worst, get out of our country",
+    "What a lovely morning for a walk in the park with the kids.",
+]
+
+
+def time_ms(fn, repeat):
+    """Median wall time of `repeat` calls in ms, plus the last result"""
+    samples, out = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), out
+
+
+def compare_probs(expected, got, atol, model=""):
+    """
+    Parity report for two (rows, classes) probability arrays (a single sigmoid
+    column is expanded to two). report["ok"] is False if any probability
+    drifts more than atol or any predicted label differs.
+    """
+    expected, got = np.asarray(expected, dtype=np.float64), np.asarray(got, dtype=np.float64)
+    if expected.shape[1] == 1:
+        expected = np.hstack([1 - expected, expected])
+        got = np.hstack([1 - got, got])
+    max_prob_diff = float(np.max(np.abs(expected - got)))
+    label_agreement = float(np.mean(expected.argmax(axis=1) == got.argmax(axis=1)))
+    return {
+        "model": model,
+        "max_prob_diff": max_prob_diff,
+        "label_agreement": label_agreement,
+        "atol": atol,
+        "ok": max_prob_diff <= atol and label_agreement == 1.0,
+    }
@@ -1,187 +1,352 @@
 import os
+import json
+import hashlib
 import torch
 import pickle
+from functools import lru_cache
 import numpy as np
 from scipy.special import softmax
 from serpapi import GoogleSearch
 from transformers import (
-    DistilBertTokenizer, DistilBertForSequenceClassification,
-    RobertaTokenizer, RobertaForSequenceClassification
+    DistilBertTokenizerFast, DistilBertForSequenceClassification,
+    RobertaTokenizerFast, RobertaForSequenceClassification
 )
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from tensorflow.keras.models import load_model
+from inference.registry import registry
+from inference.cache import files_version, LRUCache
+from inference.parallel import configure_torch, run_parallel
+from inference.tflite_backend import TFLITE_DIR, runtime_signature as keras_runtime_signature
+from inference.token_budget import TRANSFORMER_MAX_TOKENS, plan_segments, pool_probs, budget_policy
 
 # ----------------------------
 # Device Setup
 # ----------------------------
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+configure_torch()
 
-# ----------------------------
-# Load DistilBERT
-# ----------------------------
-distilbert_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../models/distilbert-fake-news_finetuned"))
-distilbert_tokenizer = DistilBertTokenizer.from_pretrained(distilbert_path, local_files_only=True)
-distilbert_model = DistilBertForSequenceClassification.from_pretrained(distilbert_path, local_files_only=True).to(device)
-distilbert_model.eval()
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../models"))
 
-# ----------------------------
-# Load RoBERTa
-# ----------------------------
-roberta_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../models/roberta-fake-news_finetuned"))
-roberta_tokenizer = RobertaTokenizer.from_pretrained(roberta_path, local_files_only=True)
-roberta_model = RobertaForSequenceClassification.from_pretrained(roberta_path, local_files_only=True).to(device)
-roberta_model.eval()
+# Models the fake-news ensemble needs (used for warm-up lists)
+FAKE_NEWS_MODELS = ["distilbert", "roberta", "cnn", "lstm", "bilstm", "keras_vocab"]
+
+# Sequence shape each Keras model was trained with (see train_scripts/)
+KERAS_SEQUENCE_SPECS = {
+    "cnn": {"maxlen": 200, "padding": "pre", "truncating": "pre"},
+    "lstm": {"maxlen": 200, "padding": "pre", "truncating": "pre"},
+    "bilstm": {"maxlen": 200, "padding": "post", "truncating": "post"},
+}
+# The CNN's Embedding has input_dim=10000; the other tokenizers produce larger ids
+CNN_MAX_INDEX = 9999
 
 # ----------------------------
-# Load CNN, LSTM, BiLSTM
+# Loaders (run lazily via the model registry)
 # ----------------------------
-lstm_model = load_model(os.path.join(os.path.dirname(__file__), "../models/lstm-model/lstm_model.h5"), compile=False)
-bilstm_model = load_model(os.path.join(os.path.dirname(__file__), "../models/bilstm-model/bilstm_model.h5"), compile=False)
-cnn_model = load_model(os.path.join(os.path.dirname(__file__), "../models/cnn-model/cnn_model.h5"), compile=False)
+distilbert_path = os.path.join(MODELS_DIR, "distilbert-fake-news_finetuned")
+roberta_path = os.path.join(MODELS_DIR, "roberta-fake-news_finetuned")
+
+def _load_distilbert():
+    tok = DistilBertTokenizerFast.from_pretrained(distilbert_path, local_files_only=True)
+    model = DistilBertForSequenceClassification.from_pretrained(distilbert_path, local_files_only=True).to(device)
+    model.eval()
+    return tok, model
+
+def _load_roberta():
+    tok = RobertaTokenizerFast.from_pretrained(roberta_path, local_files_only=True)
+    model = RobertaForSequenceClassification.from_pretrained(roberta_path, local_files_only=True).to(device)
+    model.eval()
+    return tok, model
+
+def _onnx_loader(name, tokenizer_cls, path):
+    def load():
+        # onnxruntime is optional; only imported when an ONNX backend is selected
+        from inference.onnx_backend import OnnxSequenceClassifier, onnx_model_path
+        tok = tokenizer_cls.from_pretrained(path, local_files_only=True)
+        return tok, OnnxSequenceClassifier(onnx_model_path(name))
+    return load
+
+KERAS_MODEL_FILES = {
+    "cnn": "cnn-model/cnn_model.h5",
+    "lstm": "lstm-model/lstm_model.h5",
+    "bilstm": "bilstm-model/bilstm_model.h5",
+}
+
+def _keras_loader(name):
+    def load():
+        # TensorFlow is only imported once a Keras model is actually needed;
+        # KERAS_RUNTIME may swap in a tf.function or TFLite version (inference/tflite_backend.py)
+        from inference.tflite_backend import load_keras_model
+        return load_keras_model(name, os.path.join(MODELS_DIR, KERAS_MODEL_FILES[name]))
+    return load
+
+def _pickle_loader(rel_path):
+    def load():
+        with open(os.path.join(MODELS_DIR, rel_path), "rb") as f:
+            return pickle.load(f)
+    return load
+
+registry.register("distilbert", _load_distilbert)
+registry.register("roberta", _load_roberta)
+registry.register("distilbert_onnx", _onnx_loader("distilbert", DistilBertTokenizerFast, distilbert_path))
+registry.register("roberta_onnx", _onnx_loader("roberta", RobertaTokenizerFast, roberta_path))
+registry.register("cnn", _keras_loader("cnn"))
+registry.register("lstm", _keras_loader("lstm"))
+registry.register("bilstm", _keras_loader("bilstm"))
+registry.register("cnn_tokenizer", _pickle_loader("cnn-model/cnn_tokenizer.pkl"))
+registry.register("lstm_tokenizer", _pickle_loader("lstm-model/lstm_tokenizer.pkl"))
+registry.register("bilstm_tokenizer", _pickle_loader("bilstm-model/tokenizer.pkl"))
+
+def _load_keras_vocab():
+    from inference.vocab import CompiledVocab
+    tokenizers = {name: registry.get(f"{name}_tokenizer") for name in KERAS_SEQUENCE_SPECS}
+    return CompiledVocab(tokenizers, KERAS_SEQUENCE_SPECS)
+
+registry.register("keras_vocab", _load_keras_vocab)
+
+# Transformer backend per model: "torch" (default) or "onnx"
+TRANSFORMER_BACKENDS = {
+    "distilbert": os.getenv("DISTILBERT_BACKEND", "torch").lower(),
+    "roberta": os.getenv("ROBERTA_BACKEND", "torch").lower(),
+}
+
+def get_transformer(name):
+    """(tokenizer, model) for the selected backend, falling back to PyTorch if ONNX is unavailable"""
+    if TRANSFORMER_BACKENDS.get(name) == "onnx":
+        try:
+            return registry.get(f"{name}_onnx")
+        except Exception as e:
+            print(f"⚠️ ONNX backend for {name} unavailable, using PyTorch:", e)
+            TRANSFORMER_BACKENDS[name] = "torch"
+    return registry.get(name)
 
 # ----------------------------
-# Load Tokenizers for CNN/LSTM/BiLSTM
+# Cascade (early-exit) mode
 # ----------------------------
-with open(os.path.join(os.path.dirname(__file__), "../models/lstm-model/lstm_tokenizer.pkl"), "rb") as f:
-    lstm_tokenizer = pickle.load(f)
+# "all" runs every model and keeps the most confident one; "cascade" runs the
+# tiers below in order and stops as soon as the best confidence so far reaches
+# the tier's calibrated threshold (train_scripts/calibrate_cascade.py).
+ENSEMBLE_MODE = os.getenv("ENSEMBLE_MODE", "all").lower()
+CASCADE_TIERS = [
+    ("cnn", ["cnn"]),
+    ("rnn", ["lstm", "bilstm"]),
+    ("transformer", ["distilbert", "roberta"]),
+]
+CASCADE_THRESHOLDS_PATH = os.getenv(
+    "CASCADE_THRESHOLDS", os.path.join(MODELS_DIR, "cascade_thresholds.json")
+)
+# Used for tiers missing from the thresholds file (conservative: rarely exits early)
+CASCADE_DEFAULT_THRESHOLD = float(os.getenv("CASCADE_DEFAULT_THRESHOLD", "0.99"))
 
-with open(os.path.join(os.path.dirname(__file__), "../models/bilstm-model/tokenizer.pkl"), "rb") as f:
-    tokenizer = pickle.load(f)
+@lru_cache(maxsize=None)
+def cascade_thresholds():
+    """{tier: confidence needed to stop there}; the last tier always answers"""
+    thresholds = {}
+    try:
+        with open(CASCADE_THRESHOLDS_PATH) as f:
+            thresholds = json.load(f).get("thresholds", {})
+    except FileNotFoundError:
+        print("⚠️ No cascade thresholds file, using", CASCADE_DEFAULT_THRESHOLD)
+    return {
+        tier: float(thresholds.get(tier, CASCADE_DEFAULT_THRESHOLD))
+        for tier, _ in CASCADE_TIERS[:-1]
+    }
 
-with open(os.path.join(os.path.dirname(__file__), "../models/cnn-model/cnn_tokenizer.pkl"), "rb") as f:
-    cnn_tokenizer = pickle.load(f)
+@lru_cache(maxsize=None)
+def _ensemble_files_version(backends):
+    return files_version([
+        distilbert_path, roberta_path,
+        *(os.path.join(MODELS_DIR, rel_path) for rel_path in KERAS_MODEL_FILES.values()),
+        TFLITE_DIR,
+        os.path.join(MODELS_DIR, "cnn-model/cnn_tokenizer.pkl"),
+        os.path.join(MODELS_DIR, "lstm-model/lstm_tokenizer.pkl"),
+        os.path.join(MODELS_DIR, "bilstm-model/tokenizer.pkl"),
+        CASCADE_THRESHOLDS_PATH,
+    ], extra=backends)
+
+def ensemble_version(strategy=None):
+    """Changes whenever a model file, the transformer backend/token budget, the Keras runtime or the ensemble mode changes (result-cache key)"""
+    return _ensemble_files_version(json.dumps(
+        [TRANSFORMER_BACKENDS, ENSEMBLE_MODE, budget_policy(strategy), keras_runtime_signature()], sort_keys=True
+    ))
 
 # ----------------------------
 # Helper: Vectorize input text for RNN/CNN models
 # ----------------------------
-def vectorize_text(text, tokenizer):
-    seq = tokenizer.texts_to_sequences([text])
-    padded = pad_sequences(seq, maxlen=200)  # (1, 200)
-    return padded
+def vectorize_texts(texts, tokenizer=None):
+    """
+    {"cnn", "lstm", "bilstm"} -> (len(texts), 200) arrays, each built with that
+    model's own tokenizer and padding, from one pass over the texts.
+    With an explicit Keras tokenizer, returns a single array as before (see
+    per_model_vectors for how it is shared between the three models).
+    """
+    if tokenizer is None:
+        return registry.get("keras_vocab").vectorize(texts)
+
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    seqs = tokenizer.texts_to_sequences(list(texts))
+    return pad_sequences(seqs, maxlen=200)  # (len(texts), 200)
+
+def vectorize_text(text, tokenizer=None):
+    return vectorize_texts([text], tokenizer)  # (1, 200) per model
+
+def per_model_vectors(texts_vectorized):
+    """
+    {model: array} as-is; a single array is shared by all three models, with
+    ids clipped to the CNN's embedding range (the original clip in predict_cnn).
+    """
+    if isinstance(texts_vectorized, dict):
+        return texts_vectorized
+    vec = dict.fromkeys(KERAS_SEQUENCE_SPECS, texts_vectorized)
+    vec["cnn"] = np.clip(texts_vectorized, 0, CNN_MAX_INDEX)
+    return vec
+
+# Rows per transformer forward pass in batch mode
+PREDICT_BATCH_SIZE = int(os.getenv("PREDICT_BATCH_SIZE", "32"))
 
 # ----------------------------
 # Prediction functions
 # ----------------------------
-def predict_distilbert(text):
-    inputs = distilbert_tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-    with torch.no_grad():
-        outputs = distilbert_model(**inputs)
-    probs = softmax(outputs.logits.cpu().numpy()[0])
-    return {"fake": float(probs[0]), "real": float(probs[1])}
-
-def predict_roberta(text):
-    inputs = roberta_tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
-    inputs = {k: v.to(device) for k, v in inputs.items()}
+# Full-text token ids per (model, exact text): the budget/window planner works
+# on these, so a text is tokenized once however it is later truncated or split
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+_token_cache = LRUCache(TOKEN_CACHE_SIZE)
+
+def encode_texts(name, tokenizer, texts):
+    """
+    Token ids (no special tokens, untruncated) for each text. Cached texts are
+    reused; the rest go through one batched fast-tokenizer call.
+    """
+    texts = list(texts)
+    keys = [f"{name}|{hashlib.sha256(t.encode('utf-8')).hexdigest()}" for t in texts]
+    token_ids = [_token_cache.get(k) for k in keys]
+    missing = [i for i, ids in enumerate(token_ids) if ids is None]
+    if missing:
+        encoded = tokenizer(
+            [texts[i] for i in missing], add_special_tokens=False, truncation=False,
+            return_attention_mask=False, verbose=False,
+        )["input_ids"]
+        for i, ids in zip(missing, encoded):
+            token_ids[i] = np.asarray(ids, dtype=np.int32)
+            _token_cache.set(keys[i], token_ids[i])
+    return token_ids
+
+def _transformer_segments(name, tokenizer, texts, strategy=None):
+    """
+    Token-budget policy (inference/token_budget.py): [(text_index, ids)] with
+    special tokens added, each at most TRANSFORMER_MAX_TOKENS long.
+    strategy: "truncate" or "window" (default LONG_TEXT_STRATEGY).
+    """
+    token_ids = encode_texts(name, tokenizer, texts)
+    budget = TRANSFORMER_MAX_TOKENS - tokenizer.num_special_tokens_to_add()
+    return [
+        (i, tokenizer.build_inputs_with_special_tokens(ids))
+        for i, ids in plan_segments(token_ids, budget, strategy)
+    ]
+
+def _pad_batch(tokenizer, sequences):
+    """Right-pad id sequences to the longest one -> {input_ids, attention_mask} int64 arrays"""
+    width = max(len(seq) for seq in sequences)
+    input_ids = np.full((len(sequences), width), tokenizer.pad_token_id, dtype=np.int64)
+    attention_mask = np.zeros((len(sequences), width), dtype=np.int64)
+    for row, seq in enumerate(sequences):
+        input_ids[row, :len(seq)] = seq
+        attention_mask[row, :len(seq)] = 1
+    return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+def _transformer_logits(tokenizer, model, sequences):
+    """Forward pass on id sequences, padded only to the longest one in the batch"""
+    inputs = _pad_batch(tokenizer, sequences)
+    if hasattr(model, "session"):  # ONNX Runtime backend
+        return model.logits(inputs)
+    inputs = {k: torch.from_numpy(v).to(device) for k, v in inputs.items()}
     with torch.no_grad():
-        outputs = roberta_model(**inputs)
-    probs = softmax(outputs.logits.cpu().numpy()[0])
-    return {"fake": float(probs[0]), "real": float(probs[1])}
-
-def predict_cnn(text_vectorized):
-    # Clip indices to embedding input range
-    text_vectorized = np.clip(text_vectorized, 0, 9999)
-
+        outputs = model(**inputs)
+    return outputs.logits.cpu().numpy()
+
+def _transformer_probs(tokenizer, model, sequences):
+    """Run a transformer once on a padded batch -> list of {fake, real} dicts."""
+    probs = softmax(_transformer_logits(tokenizer, model, sequences), axis=1)
+    return [{"fake": float(p[0]), "real": float(p[1])} for p in probs]
+
+def _transformer_probs_bucketed(name, tokenizer, model, texts, batch_size=PREDICT_BATCH_SIZE, strategy=None):
+    """
+    Length-sorted bucketing: segments with similar token counts share a
+    forward pass, so padding stays short. Texts split into several windows
+    get their window scores pooled. Results come back in input order.
+    """
+    texts = list(texts)
+    segments = _transformer_segments(name, tokenizer, texts, strategy)
+    order = sorted(range(len(segments)), key=lambda j: len(segments[j][1]))
+    per_text = [[] for _ in texts]
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        probs = _transformer_probs(tokenizer, model, [segments[j][1] for j in bucket])
+        for j, p in zip(bucket, probs):
+            per_text[segments[j][0]].append(p)
+    return [pool_probs(probs) for probs in per_text]
+
+def _keras_probs(model, text_vectorized, name, batch_size=PREDICT_BATCH_SIZE):
+    """Run a Keras model once on a (batch_size, maxlen) array -> list of {fake, real} dicts."""
+    # Ensure correct shape (batch_size, maxlen)
     if len(text_vectorized.shape) == 3:
         text_vectorized = text_vectorized.reshape(text_vectorized.shape[0], text_vectorized.shape[2])
 
-    pred = cnn_model.predict(text_vectorized, verbose=0)
+    if len(text_vectorized.shape) == 1:  # if single sequence, add batch dim
+        text_vectorized = np.expand_dims(text_vectorized, axis=0)
 
-    if pred.shape[1] == 1:
-        prob = float(pred[0][0])
-        return {"fake": 1 - prob, "real": prob}
-    elif pred.shape[1] == 2:
-        return {"fake": float(pred[0][0]), "real": float(pred[0][1])}
-    else:
-        raise ValueError(f"Unexpected CNN output shape: {pred.shape}")
+    pred = model.predict(text_vectorized, batch_size=batch_size, verbose=0)
 
+    # Handle sigmoid / softmax outputs
+    if pred.shape[1] == 1:  # sigmoid
+        return [{"fake": 1 - float(p[0]), "real": float(p[0])} for p in pred]
+    elif pred.shape[1] == 2:  # softmax
+        return [{"fake": float(p[0]), "real": float(p[1])} for p in pred]
+    else:
+        raise ValueError(f"Unexpected {name} output shape: {pred.shape}")
 
+def predict_distilbert_batch(texts, batch_size=PREDICT_BATCH_SIZE, strategy=None):
+    tok, model = get_transformer("distilbert")
+    return _transformer_probs_bucketed("distilbert", tok, model, texts, batch_size, strategy)
 
+def predict_roberta_batch(texts, batch_size=PREDICT_BATCH_SIZE, strategy=None):
+    tok, model = get_transformer("roberta")
+    return _transformer_probs_bucketed("roberta", tok, model, texts, batch_size, strategy)
 
-def predict_lstm(text_vectorized):
-    # Ensure correct shape (batch_size, maxlen)
-    if len(text_vectorized.shape) == 3:
-        text_vectorized = text_vectorized.reshape(text_vectorized.shape[0], text_vectorized.shape[2])
+def predict_cnn_batch(text_vectorized):
+    return _keras_probs(registry.get("cnn"), text_vectorized, "CNN")
 
-    pred = lstm_model.predict(text_vectorized, verbose=0)
+def predict_lstm_batch(text_vectorized):
+    return _keras_probs(registry.get("lstm"), text_vectorized, "LSTM")
 
-    # Handle sigmoid / softmax outputs
-    if pred.shape[1] == 1:  # sigmoid
-        prob = float(pred[0][0])
-        return {"fake": 1 - prob, "real": prob}
-    elif pred.shape[1] == 2:  # softmax
-        return {"fake": float(pred[0][0]), "real": float(pred[0][1])}
-    else:
-        raise ValueError(f"Unexpected LSTM output shape: {pred.shape}")
+def predict_bilstm_batch(text_vectorized):
+    return _keras_probs(registry.get("bilstm"), text_vectorized, "BiLSTM")
 
+def predict_distilbert(text):
+    return predict_distilbert_batch([text])[0]
 
-def predict_bilstm(text_vectorized):
-    # Ensure correct shape (batch_size, maxlen)
-    if len(text_vectorized.shape) == 3:
-        text_vectorized = text_vectorized.reshape(text_vectorized.shape[0], text_vectorized.shape[2])
+def predict_roberta(text):
+    return predict_roberta_batch([text])[0]
 
-    if len(text_vectorized.shape) == 1:  # if single sequence, add batch dim
-        text_vectorized = np.expand_dims(text_vectorized, axis=0)
+def predict_cnn(text_vectorized):
+    return predict_cnn_batch(text_vectorized)[0]
 
-    pred = bilstm_model.predict(text_vectorized, verbose=0)
+def predict_lstm(text_vectorized):
+    return predict_lstm_batch(text_vectorized)[0]
 
-    # Handle sigmoid / softmax outputs
-    if pred.shape[1] == 1:  # sigmoid
-        prob = float(pred[0][0])
-        return {"fake": 1 - prob, "real": prob}
-    elif pred.shape[1] == 2:  # softmax
-        return {"fake": float(pred[0][0]), "real": float(pred[0][1])}
-    else:
-        raise ValueError(f"Unexpected BiLSTM output shape: {pred.shape}")
+def predict_bilstm(text_vectorized):
+    return predict_bilstm_batch(text_vectorized)[0]
 
 # ----------------------------
 # Max Voting Inference
 # ----------------------------
-def predict_with_max_voting(text, text_vectorized=None):
-    results = {}
-
-    # Transformer models
-    distilbert_pred = predict_distilbert(text)
-    roberta_pred = predict_roberta(text)
-    
-    results["distilbert"] = {
-        "confidence": max(distilbert_pred["fake"], distilbert_pred["real"]),
-        "fake_percentage": round(distilbert_pred["fake"] * 100, 2),
-        "real_percentage": round(distilbert_pred["real"] * 100, 2),
-    }
-    
-    results["roberta"] = {
-        "confidence": max(roberta_pred["fake"], roberta_pred["real"]),
-        "fake_percentage": round(roberta_pred["fake"] * 100, 2),
-        "real_percentage": round(roberta_pred["real"] * 100, 2),
+def _model_result(pred):
+    return {
+        "confidence": max(pred["fake"], pred["real"]),
+        "fake_percentage": round(pred["fake"] * 100, 2),
+        "real_percentage": round(pred["real"] * 100, 2),
     }
 
-    # Classical + RNN models
-    if text_vectorized is not None:
-        cnn_pred = predict_cnn(text_vectorized)
-        lstm_pred = predict_lstm(text_vectorized)
-        bilstm_pred = predict_bilstm(text_vectorized)
-        
-        results["cnn"] = {
-            "confidence": max(cnn_pred["fake"], cnn_pred["real"]),
-            "fake_percentage": round(cnn_pred["fake"] * 100, 2),
-            "real_percentage": round(cnn_pred["real"] * 100, 2),
-        }
-        results["lstm"] = {
-            "confidence": max(lstm_pred["fake"], lstm_pred["real"]),
-            "fake_percentage": round(lstm_pred["fake"] * 100, 2),
-            "real_percentage": round(lstm_pred["real"] * 100, 2),
-        }
-        results["bilstm"] = {
-            "confidence": max(bilstm_pred["fake"], bilstm_pred["real"]),
-            "fake_percentage": round(bilstm_pred["fake"] * 100, 2),
-            "real_percentage": round(bilstm_pred["real"] * 100, 2),
-        }
-
+def _pick_best(results):
     # Pick best model by confidence
-    best_model = max(results.items(), key=lambda x: x[1]["confidence"])
-    best_model_name, best_model_data = best_model
-
+    best_model_name, best_model_data = max(results.items(), key=lambda x: x[1]["confidence"])
     return {
         "model_used": best_model_name,
         "confidence": best_model_data["confidence"],
@@ -190,6 +355,108 @@ def predict_with_max_voting(text, text_vectorized=None):
         "all_model_results": results
     }
 
+_MODEL_BATCH_FNS = {
+    "cnn": lambda texts, vec, batch_size, strategy=None: predict_cnn_batch(vec["cnn"]),
+    "lstm": lambda texts, vec, batch_size, strategy=None: predict_lstm_batch(vec["lstm"]),
+    "bilstm": lambda texts, vec, batch_size, strategy=None: predict_bilstm_batch(vec["bilstm"]),
+    "distilbert": lambda texts, vec, batch_size, strategy=None: predict_distilbert_batch(texts, batch_size, strategy),
+    "roberta": lambda texts, vec, batch_size, strategy=None: predict_roberta_batch(texts, batch_size, strategy),
+}
+
+def predict_cascade_batch(texts, texts_vectorized=None, batch_size=PREDICT_BATCH_SIZE, strategy=None):
+    """
+    Early-exit ensemble: each tier only runs on the texts no earlier tier was
+    confident about. Results carry "tier" (which tier answered) and only the
+    models that actually ran in all_model_results.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if texts_vectorized is None:
+        texts_vectorized = vectorize_texts(texts)
+    texts_vectorized = per_model_vectors(texts_vectorized)
+
+    thresholds = cascade_thresholds()
+    results = [{} for _ in texts]
+    answered_by = [None] * len(texts)
+    pending = list(range(len(texts)))
+    for tier, models in CASCADE_TIERS:
+        sub_texts = [texts[i] for i in pending]
+        sub_vec = {name: np.asarray(arr)[pending] for name, arr in texts_vectorized.items()}
+        for name in models:
+            for i, pred in zip(pending, _MODEL_BATCH_FNS[name](sub_texts, sub_vec, batch_size, strategy)):
+                results[i][name] = _model_result(pred)
+
+        threshold = thresholds.get(tier)  # None on the last tier
+        still_pending = []
+        for i in pending:
+            if threshold is not None and max(r["confidence"] for r in results[i].values()) < threshold:
+                still_pending.append(i)
+            else:
+                answered_by[i] = tier
+        pending = still_pending
+        if not pending:
+            break
+
+    return [{**_pick_best(r), "tier": tier} for r, tier in zip(results, answered_by)]
+
+def predict_with_max_voting_batch(texts, texts_vectorized=None, batch_size=PREDICT_BATCH_SIZE, mode=None, strategy=None):
+    """
+    Batched max voting: every model runs on the whole batch instead of per text.
+    texts_vectorized, if given, is vectorize_texts(texts): a {model: array} dict,
+    or one (len(texts), maxlen) array shared by all three Keras models (CNN ids clipped).
+    mode: "all" or "cascade" (default ENSEMBLE_MODE, see predict_cascade_batch).
+    strategy: how the transformers handle texts over the token budget (see token_budget.py).
+    Returns one result per text, in input order.
+    """
+    if (mode or ENSEMBLE_MODE) == "cascade":
+        return predict_cascade_batch(texts, texts_vectorized, batch_size, strategy)
+    texts = list(texts)
+    if not texts:
+        return []
+
+    # Transformer models (PyTorch/ONNX) and Keras models run as two concurrent branches
+    def transformer_branch():
+        return {
+            "distilbert": predict_distilbert_batch(texts, batch_size, strategy),
+            "roberta": predict_roberta_batch(texts, batch_size, strategy),
+        }
+
+    def keras_branch():
+        vec = per_model_vectors(texts_vectorized)
+        return {
+            "cnn": predict_cnn_batch(vec["cnn"]),
+            "lstm": predict_lstm_batch(vec["lstm"]),
+            "bilstm": predict_bilstm_batch(vec["bilstm"]),
+        }
+
+    branches = {"transformers": transformer_branch}
+    if texts_vectorized is not None:  # Classical + RNN models
+        branches["keras"] = keras_branch
+    per_model = {}
+    for branch_result in run_parallel(branches).values():
+        per_model.update(branch_result)
+
+    return [
+        _pick_best({name: _model_result(preds[i]) for name, preds in per_model.items()})
+        for i in range(len(texts))
+    ]
+
+def predict_with_max_voting(text, text_vectorized=None, mode=None, strategy=None):
+    return predict_with_max_voting_batch([text], text_vectorized, mode=mode, strategy=strategy)[0]
+
+def predict_batch(texts, batch_size=PREDICT_BATCH_SIZE, strategy=None):
+    """
+    List-in / list-out fake-news ensemble for bulk scoring.
+    Vectorizes all texts in one compiled-vocab pass, runs CNN/LSTM/BiLSTM
+    on whole arrays and the transformers on length-sorted buckets.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    texts_vectorized = vectorize_texts(texts)
+    return predict_with_max_voting_batch(texts, texts_vectorized, batch_size, strategy=strategy)
+
 # ----------------------------
 # SerpAPI integration
 # ----------------------------
@@ -217,6 +484,6 @@ def serpapi_search(query):
 
 if __name__ == "__main__":
     text = "Rahul Gandhi is from the male gender"
-    text_vectorized = vectorize_text(text, tokenizer)
+    text_vectorized = vectorize_text(text)
     results = predict_with_max_voting(text, text_vectorized)
     print(results)
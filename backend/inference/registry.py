@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+# Comma-separated model names to load at startup ("all" for everything).
+# Anything not listed is loaded on first use.
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "")
+
+
+# ----------------------------
+# Lazy model registry
+# ----------------------------
+class ModelRegistry:
+    """
+    Name -> loader mapping. Each model is loaded on first `get()` (once,
+    even under concurrent requests) and kept for the life of the process.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._load_times = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        """Register a zero-arg loader. The first registration of a name wins."""
+        with self._lock:
+            if name not in self._loaders:
+                self._loaders[name] = loader
+                self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+        with self._locks[name]:
+            if name not in self._models:
+                start = time.perf_counter()
+                model = self._loaders[name]()
+                self._load_times[name] = round(time.perf_counter() - start, 3)
+                self._models[name] = model
+                print(f"✅ Loaded {name} in {self._load_times[name]:.2f}s")
+        return self._models[name]
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def names(self):
+        return list(self._loaders)
+
+    def load_times(self):
+        return dict(self._load_times)
+
+    def unload(self, name):
+        with self._locks.get(name, self._lock):
+            self._models.pop(name, None)
+            self._load_times.pop(name, None)
+
+    def warm_up(self, names=None):
+        """Load `names` (or MODEL_WARMUP) eagerly; errors are reported, not raised."""
+        if names is None:
+            names = [n.strip() for n in MODEL_WARMUP.split(",") if n.strip()]
+        if "all" in names:
+            names = self.names()
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"❌ Warm-up failed for {name}:", e)
+        return self.load_times()
+
+    def status(self):
+        return {
+            name: {"loaded": self.is_loaded(name), "load_time_s": self._load_times.get(name)}
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,41 @@
+import os
+from inference.cache import TieredCache, cached_batch
+
+# ----------------------------
+# Config
+# ----------------------------
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "10000"))  # in-process entries, 0 disables
+RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB", "")  # SQLite path for the shared disk tier (off if empty)
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "86400"))  # seconds, 0 = no expiry
+RESULT_CACHE_DISK_MAX = int(os.getenv("RESULT_CACHE_DISK_MAX", "200000"))  # disk entries before LRU eviction
+
+ensemble_cache = TieredCache(
+    "ensemble", RESULT_CACHE_SIZE, RESULT_CACHE_DB or None, RESULT_CACHE_TTL or None, RESULT_CACHE_DISK_MAX
+)
+hatespeech_cache = TieredCache(
+    "hatespeech", RESULT_CACHE_SIZE, RESULT_CACHE_DB or None, RESULT_CACHE_TTL or None, RESULT_CACHE_DISK_MAX
+)
+
+
+# ----------------------------
+# Cached predictors (list in, list out)
+# ----------------------------
+def predict_ensemble_cached(texts, compute_fn=None, strategy=None):
+    """
+    Max-voting results keyed on normalized text + model versions + long-text
+    strategy; misses go to compute_fn (default predict_batch with that strategy).
+    """
+    from inference.predict import predict_batch, ensemble_version
+
+    compute_fn = compute_fn or (lambda missing: predict_batch(missing, strategy=strategy))
+    return cached_batch(ensemble_cache, texts, ensemble_version(strategy), compute_fn)
+
+
+def predict_hatespeech_cached(texts):
+    from inference.hatespeech.predict_hatespeech import predict_hatespeech, hatespeech_version
+
+    return cached_batch(hatespeech_cache, texts, hatespeech_version(), predict_hatespeech)
+
+
+def cache_stats():
+    return {"ensemble": ensemble_cache.stats(), "hatespeech": hatespeech_cache.stats()}
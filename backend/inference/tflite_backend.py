@@ -0,0 +1,257 @@
+"""
+Optional fast execution paths for the Keras models (CNN / LSTM / BiLSTM and
+the hate-speech BiLSTM). Keras' model.predict builds a data pipeline on every
+call, which dominates the cost of scoring one row.
+
+    KERAS_RUNTIME=keras     model.predict (default)
+    KERAS_RUNTIME=function  model(x, training=False) inside a tf.function
+    KERAS_RUNTIME=tflite    TensorFlow Lite interpreter (XNNPACK), converted ahead of time
+
+Conversion (fp32 + float16 + int8 dynamic range) and parity check against Keras:
+    python -m inference.tflite_backend export bilstm
+    python -m inference.tflite_backend parity hatespeech
+
+TFLITE_QUANTIZATION picks the converted file (fp32 | float16 | int8).
+"""
+import os
+import sys
+import importlib
+import threading
+import numpy as np
+
+from inference.parallel import TF_INTRA_OP_THREADS
+from inference.parity import PARITY_TEXTS, compare_probs
+
+TFLITE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../models/tflite"))
+KERAS_RUNTIME = os.getenv("KERAS_RUNTIME", "keras").lower()
+TFLITE_QUANTIZATION = os.getenv("TFLITE_QUANTIZATION", "int8").lower()
+TFLITE_THREADS = int(os.getenv("TFLITE_THREADS", str(TF_INTRA_OP_THREADS)))
+
+QUANTIZATIONS = ("fp32", "float16", "int8")
+KERAS_MODEL_NAMES = ("cnn", "lstm", "bilstm", "hatespeech")
+
+# Probability tolerance for the parity check
+PARITY_ATOL = {"fp32": 1e-4, "float16": 1e-2, "int8": 0.05}
+
+
+def tflite_model_path(name, quantization=TFLITE_QUANTIZATION):
+    suffix = {"fp32": "", "float16": ".fp16", "int8": ".int8"}[quantization]
+    return os.path.join(TFLITE_DIR, f"{name}{suffix}.tflite")
+
+
+def runtime_signature():
+    """Part of the result-cache version: quantized paths give slightly different scores"""
+    return f"tflite:{TFLITE_QUANTIZATION}" if KERAS_RUNTIME == "tflite" else KERAS_RUNTIME
+
+
+# ----------------------------
+# Conversion
+# ----------------------------
+def convert_to_tflite(keras_model, out_path, quantization="fp32"):
+    """
+    float16: weights stored as fp16. int8: dynamic-range quantization (int8
+    weights, float activations), which needs no calibration data.
+    The graph is traced with a fixed batch of 1 so LSTMs lower to fused
+    builtin ops; if that still fails, Select TF ops (flex delegate) are used.
+    """
+    import tensorflow as tf
+
+    def converter(static_batch):
+        model = keras_model
+        if static_batch:
+            source = keras_model.inputs[0]
+            inputs = tf.keras.Input(shape=source.shape[1:], batch_size=1, dtype=source.dtype)
+            model = tf.keras.Model(inputs, keras_model(inputs))
+        conv = tf.lite.TFLiteConverter.from_keras_model(model)
+        if quantization in ("float16", "int8"):
+            conv.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == "float16":
+            conv.target_spec.supported_types = [tf.float16]
+        return conv
+
+    try:
+        flatbuffer = converter(static_batch=True).convert()
+    except Exception as e:
+        print(f"⚠️ Builtin-only conversion failed ({e}); retrying with Select TF ops")
+        conv = converter(static_batch=False)
+        conv.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+        conv._experimental_lower_tensor_list_ops = False
+        flatbuffer = conv.convert()
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(flatbuffer)
+    return out_path
+
+
+# ----------------------------
+# Runtime
+# ----------------------------
+def _interpreter_cls():
+    for module in ("tflite_runtime.interpreter", "ai_edge_litert.interpreter"):  # standalone runtimes
+        try:
+            return importlib.import_module(module).Interpreter
+        except ImportError:
+            pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteClassifier:
+    """TFLite interpreter with a Keras-style predict(x) -> (rows, classes) array"""
+
+    def __init__(self, path, threads=TFLITE_THREADS):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"TFLite model not found: {path} (run `python -m inference.tflite_backend export`)")
+        self.path = path
+        self.interpreter = _interpreter_cls()(model_path=path, num_threads=threads or None)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch = int(self._input["shape"][0])
+        # models converted with a static batch of 1 are invoked row by row
+        self._fixed_batch = int(self._input.get("shape_signature", self._input["shape"])[0]) != -1
+        self._lock = threading.Lock()  # an interpreter must not be invoked concurrently
+
+    def _run(self, x):
+        if x.shape[0] != self._batch:
+            self._batch = None  # a failed resize/allocate is retried on the next call
+            self.interpreter.resize_tensor_input(self._input["index"], list(x.shape))
+            self.interpreter.allocate_tensors()
+            self._batch = x.shape[0]
+        self.interpreter.set_tensor(self._input["index"], x)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output["index"]).copy()
+
+    def predict(self, x, batch_size=None, verbose=0):
+        x = np.asarray(x, dtype=self._input["dtype"])
+        if x.ndim == 1:
+            x = x[None, :]
+        step = 1 if self._fixed_batch else (batch_size or len(x) or 1)
+        outputs = []
+        with self._lock:
+            for start in range(0, len(x), step):
+                chunk = x[start:start + step]
+                try:
+                    outputs.append(self._run(chunk))
+                except (RuntimeError, ValueError):
+                    # some converted RNNs only run with the batch size they were traced with
+                    outputs += [self._run(row[None, :]) for row in chunk]
+        if not outputs:
+            return np.zeros((0, self._output["shape"][-1]), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+class KerasFunctionModel:
+    """model(x, training=False) compiled once with tf.function; skips predict()'s per-call setup"""
+
+    def __init__(self, keras_model):
+        import tensorflow as tf
+
+        self.model = keras_model
+        self._tf = tf
+        call = lambda x: keras_model(x, training=False)
+        try:
+            self._fn = tf.function(call, reduce_retracing=True)
+        except TypeError:  # TF < 2.9
+            self._fn = tf.function(call, experimental_relax_shapes=True)
+
+    def predict(self, x, batch_size=None, verbose=0):
+        x = np.asarray(x)
+        if x.ndim == 1:
+            x = x[None, :]
+        step = batch_size or len(x) or 1
+        outputs = [self._fn(self._tf.constant(x[s:s + step])).numpy() for s in range(0, len(x), step)]
+        if not outputs:
+            return np.zeros((0, self.model.output_shape[-1]), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+def load_keras_model(name, h5_path, runtime=None):
+    """
+    Model object with a Keras-style predict() for the selected KERAS_RUNTIME.
+    The TFLite path doesn't load the .h5 at all; if its file is missing it
+    falls back to the Keras model.
+    """
+    runtime = runtime or KERAS_RUNTIME
+    if runtime == "tflite":
+        try:
+            return TFLiteClassifier(tflite_model_path(name))
+        except Exception as e:
+            print(f"⚠️ TFLite model for {name} unavailable, using Keras:", e)
+
+    from inference.parallel import configure_tensorflow
+    configure_tensorflow()
+    from tensorflow.keras.models import load_model
+
+    model = load_model(h5_path, compile=False)
+    if runtime == "function":
+        return KerasFunctionModel(model)
+    return model
+
+
+# ----------------------------
+# Parity
+# ----------------------------
+def check_parity(keras_model, fast_model, X, atol=None):
+    """
+    Compare a converted/compiled model against Keras predict() on inputs X.
+    report["ok"] is False if the probabilities drift more than atol or any
+    predicted label differs.
+    """
+    if atol is None:
+        quantization = "fp32"
+        for q, suffix in (("float16", ".fp16.tflite"), ("int8", ".int8.tflite")):
+            if getattr(fast_model, "path", "").endswith(suffix):
+                quantization = q
+        atol = PARITY_ATOL[quantization]
+
+    expected = keras_model.predict(X, verbose=0)
+    got = fast_model.predict(X)
+    return compare_probs(expected, got, atol, getattr(fast_model, "path", type(fast_model).__name__))
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+def _source(name):
+    """(h5 path, parity inputs) for a model name"""
+    if name == "hatespeech":
+        from inference.hatespeech.predict_hatespeech import MODEL_PATH, registry
+        from inference.hatespeech.preprocessing import preprocess_texts
+
+        X, _ = preprocess_texts(PARITY_TEXTS, registry.get("hatespeech_tokenizer"))
+        return MODEL_PATH, X
+    from inference.predict import MODELS_DIR, KERAS_MODEL_FILES, vectorize_texts
+
+    return os.path.join(MODELS_DIR, KERAS_MODEL_FILES[name]), vectorize_texts(PARITY_TEXTS)[name]
+
+
+def main(argv):
+    if len(argv) != 2 or argv[0] not in ("export", "parity") or argv[1] not in KERAS_MODEL_NAMES:
+        print(f"Usage: python -m inference.tflite_backend {{export|parity}} {{{'|'.join(KERAS_MODEL_NAMES)}}}")
+        return 2
+    command, name = argv
+    h5_path, X = _source(name)
+    keras_model = load_keras_model(name, h5_path, runtime="keras")
+
+    if command == "export":
+        for quantization in QUANTIZATIONS:
+            print("✅ Converted", convert_to_tflite(keras_model, tflite_model_path(name, quantization), quantization))
+
+    ok = True
+    report = check_parity(keras_model, KerasFunctionModel(keras_model), X)
+    print(report)
+    ok = ok and report["ok"]
+    for quantization in QUANTIZATIONS:
+        path = tflite_model_path(name, quantization)
+        if not os.path.exists(path):
+            continue
+        report = check_parity(keras_model, TFLiteClassifier(path), X)
+        print(report)
+        ok = ok and report["ok"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
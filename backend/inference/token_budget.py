@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+
+# ----------------------------
+# Config
+# ----------------------------
+# Transformer inputs are cut to a token budget instead of always running 512
+# positions. Texts over the budget are either truncated to head + tail
+# (most of the signal sits at the start and end of an article), or split into
+# overlapping windows whose scores are pooled, so long transcripts are scored
+# in full. Windows cost up to MAX_WINDOWS forward rows per text (8x for a long
+# article), so they are only the default for video transcripts.
+TRANSFORMER_MAX_TOKENS = int(os.getenv("TRANSFORMER_MAX_TOKENS", "512"))  # including special tokens
+TRUNCATION_HEAD_TOKENS = int(os.getenv("TRUNCATION_HEAD_TOKENS", "128"))  # rest of the budget goes to the tail
+LONG_TEXT_STRATEGY = os.getenv("LONG_TEXT_STRATEGY", "truncate").lower()  # truncate | window: articles, pasted text, OCR
+TRANSCRIPT_TEXT_STRATEGY = os.getenv("TRANSCRIPT_TEXT_STRATEGY", "window").lower()  # same, for video transcripts
+WINDOW_OVERLAP = int(os.getenv("WINDOW_OVERLAP", "64"))  # tokens shared by consecutive windows
+MAX_WINDOWS = int(os.getenv("MAX_WINDOWS", "8"))
+WINDOW_POOLING = os.getenv("WINDOW_POOLING", "mean").lower()  # mean | max (most confident window)
+
+
+def head_tail(ids, budget, head=TRUNCATION_HEAD_TOKENS):
+    """First `head` tokens + the last (budget - head) tokens"""
+    if len(ids) <= budget:
+        return list(ids)
+    head = min(head, budget)
+    tail = budget - head
+    return list(ids[:head]) + (list(ids[-tail:]) if tail else [])
+
+
+def sliding_windows(ids, budget, overlap=WINDOW_OVERLAP, max_windows=MAX_WINDOWS):
+    """
+    Overlapping windows of `budget` tokens covering all of `ids`. If that takes
+    more than max_windows, max_windows evenly spaced windows are used instead.
+    """
+    if len(ids) <= budget:
+        return [list(ids)]
+    step = max(1, budget - overlap)
+    last_start = len(ids) - budget
+    starts = list(range(0, last_start, step)) + [last_start]
+    if max_windows and len(starts) > max_windows:
+        starts = sorted(set(np.linspace(0, last_start, max_windows).round().astype(int).tolist()))
+    return [list(ids[s:s + budget]) for s in starts]
+
+
+def plan_segments(token_ids, budget, strategy=None):
+    """
+    token_ids: one list of ids (no special tokens) per text.
+    Returns [(text_index, ids)], one or more segments per text, each <= budget.
+    """
+    strategy = strategy or LONG_TEXT_STRATEGY
+    segments = []
+    for i, ids in enumerate(token_ids):
+        if strategy == "window":
+            segments += [(i, w) for w in sliding_windows(ids, budget)]
+        else:
+            segments.append((i, head_tail(ids, budget)))
+    return segments
+
+
+def pool_probs(probs, how=None):
+    """Combine per-window {fake, real} dicts into one"""
+    if len(probs) == 1:
+        return probs[0]
+    if (how or WINDOW_POOLING) == "max":
+        return max(probs, key=lambda p: max(p["fake"], p["real"]))
+    return {
+        "fake": float(np.mean([p["fake"] for p in probs])),
+        "real": float(np.mean([p["real"] for p in probs])),
+    }
+
+
+def budget_policy(strategy=None):
+    """Settings that change transformer scores (part of the result-cache version)"""
+    return {
+        "max_tokens": TRANSFORMER_MAX_TOKENS, "head": TRUNCATION_HEAD_TOKENS,
+        "strategy": strategy or LONG_TEXT_STRATEGY,
+        "overlap": WINDOW_OVERLAP, "max_windows": MAX_WINDOWS, "pooling": WINDOW_POOLING,
+    }
@@ -0,0 +1,123 @@
+import numpy as np
+
+# ----------------------------
+# Compiled vocabulary for Keras tokenizers
+# ----------------------------
+# Keras' Tokenizer.texts_to_sequences walks every word in Python, once per
+# tokenizer. CompiledVocab merges several tokenizers into one word -> row dict
+# and a (rows, n_tokenizers) id table, so a batch is split into words once,
+# looked up once, and every model's ids come out of a single NumPy gather.
+# Padding/truncation is vectorized as well. Output matches
+# pad_sequences(tokenizer.texts_to_sequences(texts), ...) exactly.
+
+SKIP = -1  # word dropped by Keras (unknown without oov_token, or beyond num_words)
+
+
+def _split_config(tokenizer):
+    return (tokenizer.lower, tokenizer.filters, tokenizer.split)
+
+
+def _word_splitter(lower, filters, split):
+    """Same steps as keras text_to_word_sequence"""
+    table = str.maketrans({c: split for c in filters})
+
+    def words(text):
+        if lower:
+            text = text.lower()
+        return [w for w in text.translate(table).split(split) if w]
+    return words
+
+
+def _keras_id(tokenizer, index, oov_index):
+    if index is None:
+        return oov_index
+    if tokenizer.num_words and index >= tokenizer.num_words:
+        return oov_index
+    return index
+
+
+def pad_ids(rows, ids, n_rows, maxlen, padding="pre", truncating="pre"):
+    """
+    Vectorized pad_sequences for a flat token stream: rows[i] is the text index
+    of ids[i] (non-decreasing, SKIP ids already removed).
+    """
+    out = np.zeros((n_rows, maxlen), dtype=np.int32)
+    if ids.size == 0:
+        return out
+    lengths = np.bincount(rows, minlength=n_rows)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    pos = np.arange(ids.size) - starts[rows]  # position within its text
+    length = lengths[rows]
+
+    # keep the first maxlen ("post") or the last maxlen ("pre") tokens
+    if truncating == "pre":
+        pos = pos - np.maximum(length - maxlen, 0)
+    keep = (pos >= 0) & (pos < maxlen)
+    kept_len = np.minimum(length, maxlen)
+    col = pos if padding == "post" else pos + (maxlen - kept_len)
+    out[rows[keep], col[keep]] = ids[keep]
+    return out
+
+
+class CompiledVocab:
+    def __init__(self, tokenizers, specs=None):
+        """
+        tokenizers: {name: keras Tokenizer}; specs: {name: {"maxlen", "padding", "truncating"}}
+        (defaults match pad_sequences: maxlen=200, pre/pre).
+        """
+        self.names = list(tokenizers)
+        self.specs = {
+            name: {"maxlen": 200, "padding": "pre", "truncating": "pre", **(specs or {}).get(name, {})}
+            for name in self.names
+        }
+        for tok in tokenizers.values():
+            if tok.char_level or getattr(tok, "analyzer", None) is not None:
+                raise ValueError("CompiledVocab only supports word-level tokenizers")
+
+        # Tokenizers that split text the same way share one splitting pass
+        self._groups = {}
+        for col, name in enumerate(self.names):
+            self._groups.setdefault(_split_config(tokenizers[name]), []).append(col)
+        self._splitters = {cfg: _word_splitter(*cfg) for cfg in self._groups}
+
+        words = {}
+        for tok in tokenizers.values():
+            for w in tok.word_index:
+                words.setdefault(w, len(words))
+        self.word_rows = words
+        self.oov_row = len(words)  # unknown to every tokenizer
+
+        table = np.full((len(words) + 1, len(self.names)), SKIP, dtype=np.int32)
+        for col, name in enumerate(self.names):
+            tok = tokenizers[name]
+            oov_index = tok.word_index.get(tok.oov_token) if tok.oov_token is not None else None
+            for w, row in words.items():
+                i = _keras_id(tok, tok.word_index.get(w), oov_index)
+                if i is not None:
+                    table[row, col] = i
+            if oov_index is not None:
+                table[self.oov_row, col] = oov_index
+        self.table = table
+
+    def _lookup(self, texts, splitter):
+        rows, token_rows = [], []
+        get, oov = self.word_rows.get, self.oov_row
+        for i, text in enumerate(texts):
+            words = splitter(text)
+            token_rows.extend(get(w, oov) for w in words)
+            rows.append(np.full(len(words), i, dtype=np.int64))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        return rows, np.asarray(token_rows, dtype=np.int64)
+
+    def vectorize(self, texts):
+        """{name: (len(texts), maxlen) int32 array} for every tokenizer, from one pass over the texts"""
+        texts = list(texts)
+        out = {}
+        for cfg, cols in self._groups.items():
+            rows, token_rows = self._lookup(texts, self._splitters[cfg])
+            ids = self.table[token_rows][:, cols] if token_rows.size else np.zeros((0, len(cols)), np.int32)
+            for j, col in enumerate(cols):
+                name = self.names[col]
+                keep = ids[:, j] != SKIP
+                out[name] = pad_ids(rows[keep], ids[keep, j], len(texts), **self.specs[name])
+        return out
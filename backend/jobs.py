@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+
+from workspace import remove_workspace
+
+# ----------------------
+# Config
+# ----------------------
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "1"))  # worker processes (each holds its own models)
+JOBS_DB = os.getenv("JOBS_DB", "")  # SQLite path; in-memory store if empty
+JOBS_KEEP = int(os.getenv("JOBS_KEEP", "1000"))  # finished jobs kept by the in-memory store
+
+TERMINAL_STATUSES = ("done", "failed")
+
+
+# ----------------------
+# Job stores
+# ----------------------
+class MemoryJobStore:
+    def __init__(self, keep=JOBS_KEEP):
+        self.keep = keep
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job_id, kind):
+        now = time.time()
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id, "kind": kind, "status": "queued", "stage": None,
+                "stages": [], "result": None, "error": None, "created": now, "updated": now,
+            }
+            finished = [j for j, job in self._jobs.items() if job["status"] in TERMINAL_STATUSES]
+            for old in finished[: max(0, len(finished) - self.keep)]:
+                del self._jobs[old]
+
+    def update(self, job_id, stage=None, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if stage:
+                job["stage"] = stage
+                job["stages"].append({"stage": stage, "at": time.time()})
+            job.update(fields)
+            job["updated"] = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+
+class SQLiteJobStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, kind TEXT, status TEXT, stage TEXT, "
+                "stages TEXT, result TEXT, error TEXT, created REAL, updated REAL)"
+            )
+
+    def create(self, job_id, kind):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, 'queued', NULL, '[]', NULL, NULL, ?, ?)", (job_id, kind, now, now)
+            )
+
+    def update(self, job_id, stage=None, **fields):
+        job = self.get(job_id)
+        if job is None:
+            return
+        if stage:
+            job["stage"] = stage
+            job["stages"].append({"stage": stage, "at": time.time()})
+        job.update(fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, stages = ?, result = ?, error = ?, updated = ? WHERE id = ?",
+                (job["status"], job["stage"], json.dumps(job["stages"]), json.dumps(job["result"]),
+                 job["error"], time.time(), job_id),
+            )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, stage, stages, result, error, created, updated FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "kind", "status", "stage", "stages", "result", "error", "created", "updated")
+        job = dict(zip(keys, row))
+        job["stages"] = json.loads(job["stages"] or "[]")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+# ----------------------
+# Work run inside the worker processes
+# ----------------------
+def _init_worker():
+    # Same OCR binary setting as app.py
+    try:
+        import pytesseract
+    except ImportError:
+        return
+    pytesseract.pytesseract.tesseract_cmd = os.getenv(
+        "TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+    )
+
+
+def _run_video_job(payload, progress):
+    from audio import load_audio
+    from transcription import transcribe
+    from media_download import download_media
+    import media_cache
+    from scoring import score_text
+    from inference.token_budget import TRANSCRIPT_TEXT_STRATEGY
+
+    media_key = payload["media_key"]
+    cached = media_cache.get_result(media_key, "analyze_video")
+    if cached:
+        progress("cached")
+        return cached
+
+    transcript = media_cache.get_transcript(media_key)
+    if not transcript:
+        video_path = payload.get("video_path")
+        if payload.get("url"):
+            progress("download")
+            video_path = os.path.join(payload["workdir"], "input_video.mp4")
+            download_media(payload["url"], video_path)
+        progress("audio")
+        audio = load_audio(video_path)
+        progress("transcribe")
+        transcript = transcribe(audio)
+        media_cache.set_transcript(media_key, transcript)
+
+    progress("score")
+    result = score_text(transcript or "Transcription failed or empty", TRANSCRIPT_TEXT_STRATEGY)
+    if transcript:
+        media_cache.set_result(media_key, "analyze_video", result)
+    return result
+
+
+def _run_image_job(payload, progress):
+    from ocr import ocr_image, open_image
+    from scoring import score_text
+
+    progress("ocr")
+    with open_image(payload["image_path"]) as image:  # same pixel guard as /analyze-image
+        text = ocr_image(image)["text"]
+    if not text:
+        raise RuntimeError("No text extracted")
+    progress("score")
+    return score_text(text)
+
+
+JOB_RUNNERS = {"video": _run_video_job, "image": _run_image_job}
+
+
+def _run_job(job_id, kind, payload, events):
+    def progress(stage):
+        events.put((job_id, stage))
+
+    try:
+        progress("running")
+        return JOB_RUNNERS[kind](payload, progress)
+    finally:
+        remove_workspace(payload.get("workdir"))
+
+
+# ----------------------
+# Queue (lives in the web process)
+# ----------------------
+class JobQueue:
+    """
+    Local job subsystem: a process pool runs the work, workers report stage
+    changes over a manager queue, and the store keeps status/results for polling.
+    """
+
+    def __init__(self, workers=JOBS_WORKERS, store=None):
+        self.store = store or (SQLiteJobStore(JOBS_DB) if JOBS_DB else MemoryJobStore())
+        ctx = multiprocessing.get_context("spawn")
+        self._manager = ctx.Manager()
+        self._events = self._manager.Queue()
+        self._lock = threading.Lock()
+        self._ctx = ctx
+        self._workers = workers
+        self._closed = False
+        self._pool = self._new_pool()
+        self._listener = threading.Thread(target=self._listen, name="job-events", daemon=True)
+        self._listener.start()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self._workers, mp_context=self._ctx, initializer=_init_worker)
+
+    def _replace_broken_pool(self, broken):
+        """A worker died (OOM kill, segfault): every later submit would fail, so start a fresh pool"""
+        with self._lock:
+            if self._pool is broken and not self._closed:
+                print("⚠️ Job worker pool broke; starting a new one")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+
+    def _listen(self):
+        while True:
+            try:
+                job_id, stage = self._events.get()
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                job = self.store.get(job_id)
+                # stage events can arrive after the result; never reopen a finished job
+                if job and job["status"] not in TERMINAL_STATUSES:
+                    self.store.update(job_id, stage=stage, status="running")
+
+    def _finished(self, job_id, pool, payload, future):
+        try:
+            result, error = future.result(), None
+        except CancelledError:  # a BaseException: shutdown() cancelled the queued job
+            result, error = None, "cancelled"
+            remove_workspace(payload.get("workdir"))  # _run_job never ran, so its cleanup didn't either
+        except BrokenProcessPool as e:
+            result, error = None, str(e) or e.__class__.__name__
+            remove_workspace(payload.get("workdir"))  # the worker died before (or during) its cleanup
+            self._replace_broken_pool(pool)
+        except Exception as e:
+            result, error = None, str(e) or e.__class__.__name__
+        with self._lock:
+            if error is None:
+                self.store.update(job_id, stage="done", status="done", result=result)
+            else:
+                self.store.update(job_id, stage="failed", status="failed", error=error)
+
+    def submit(self, kind, payload):
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, kind)
+        pool = self._pool
+        try:
+            future = pool.submit(_run_job, job_id, kind, payload, self._events)
+        except BrokenProcessPool:
+            self._replace_broken_pool(pool)
+            pool = self._pool
+            future = pool.submit(_run_job, job_id, kind, payload, self._events)
+        future.add_done_callback(lambda f: self._finished(job_id, pool, payload, f))
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
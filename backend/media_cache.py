@@ -0,0 +1,102 @@
+import os
+import re
+import hashlib
+from urllib.parse import urlsplit, parse_qs
+
+from inference.cache import TieredCache
+from url_cache import canonicalize_url
+
+# ----------------------
+# Config
+# ----------------------
+MEDIA_CACHE_SIZE = int(os.getenv("MEDIA_CACHE_SIZE", "1000"))  # in-process entries, 0 disables
+MEDIA_CACHE_DB = os.getenv("MEDIA_CACHE_DB", "")  # SQLite path for the shared disk tier (off if empty)
+MEDIA_CACHE_TTL = int(os.getenv("MEDIA_CACHE_TTL", "604800"))  # seconds, 0 = no expiry
+MEDIA_CACHE_DISK_MAX = int(os.getenv("MEDIA_CACHE_DISK_MAX", "50000"))
+
+media_cache = TieredCache(
+    "media", MEDIA_CACHE_SIZE, MEDIA_CACHE_DB or None, MEDIA_CACHE_TTL or None, MEDIA_CACHE_DISK_MAX
+)
+
+_YOUTUBE_HOSTS = ("youtube.com", "youtu.be", "youtube-nocookie.com")
+_YOUTUBE_PATH = re.compile(r"^/(?:shorts|embed|live|v)/([\w-]{11})")
+_INSTAGRAM_PATH = re.compile(r"^/(?:[\w.]+/)?(?:reel|reels|p|tv)/([\w-]+)")
+_TIKTOK_PATH = re.compile(r"/video/(\d+)")
+
+
+# ----------------------
+# Media identity
+# ----------------------
+def media_key_from_url(url):
+    """Platform video ID when recognizable (so every share link of a clip matches), else the canonical URL"""
+    parts = urlsplit(url.strip() if "://" in url else f"https://{url.strip()}")
+    host = (parts.hostname or "").lower()
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+
+    if host.endswith(_YOUTUBE_HOSTS):
+        if host == "youtu.be":
+            video_id = parts.path.strip("/").split("/")[0]
+            if video_id:
+                return f"youtube:{video_id}"
+        match = _YOUTUBE_PATH.match(parts.path)
+        if match:
+            return f"youtube:{match.group(1)}"
+        video_id = parse_qs(parts.query).get("v", [None])[0]
+        if video_id:
+            return f"youtube:{video_id}"
+    elif host.endswith("instagram.com"):
+        match = _INSTAGRAM_PATH.match(parts.path)
+        if match:
+            return f"instagram:{match.group(1)}"
+    elif host.endswith("tiktok.com"):
+        match = _TIKTOK_PATH.search(parts.path)
+        if match:
+            return f"tiktok:{match.group(1)}"
+    return f"url:{canonicalize_url(url)}"
+
+
+def media_key_from_upload(file_storage, chunk_size=1024 * 1024):
+    """sha256 of an uploaded file's bytes; the stream is rewound so it can still be saved"""
+    stream = file_storage.stream
+    h = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        h.update(chunk)
+    stream.seek(0)
+    return f"sha256:{h.hexdigest()}"
+
+
+# ----------------------
+# Cache entries
+# ----------------------
+def _transcript_key(media_key):
+    # a transcript of a download cut to MAX_MEDIA_DURATION must not be served as the full one
+    from transcription import transcript_signature
+    from media_download import MAX_MEDIA_DURATION
+    return f"transcript|{transcript_signature()}|max{MAX_MEDIA_DURATION}|{media_key}"
+
+
+def _result_key(media_key, kind):
+    from inference.predict import ensemble_version
+    from inference.token_budget import TRANSCRIPT_TEXT_STRATEGY
+    from inference.hatespeech.predict_hatespeech import hatespeech_version
+    return f"result|{kind}|{ensemble_version(TRANSCRIPT_TEXT_STRATEGY)}:{hatespeech_version()}|{_transcript_key(media_key)}"
+
+
+def get_transcript(media_key):
+    return media_cache.get(_transcript_key(media_key)) if media_key else None
+
+
+def set_transcript(media_key, transcript):
+    if media_key and transcript:
+        media_cache.set(_transcript_key(media_key), transcript)
+
+
+def get_result(media_key, kind):
+    """Full downstream result for `kind` (e.g. "analyze_video"), or None"""
+    return media_cache.get(_result_key(media_key, kind)) if media_key else None
+
+
+def set_result(media_key, kind, result):
+    if media_key and result:
+        media_cache.set(_result_key(media_key, kind), result)
@@ -0,0 +1,62 @@
+import os
+
+import yt_dlp
+
+from audio import ffmpeg_binary
+
+# ----------------------
+# Config
+# ----------------------
+# Transcription only needs the audio track, so skip the video stream by default
+AUDIO_ONLY_DOWNLOAD = os.getenv("AUDIO_ONLY_DOWNLOAD", "1") == "1"
+MAX_MEDIA_DURATION = int(os.getenv("MAX_MEDIA_DURATION", "0"))  # seconds; only the first N are fetched (0 = all)
+MAX_MEDIA_BYTES = int(os.getenv("MAX_MEDIA_BYTES", "0"))  # refuse larger downloads (0 = no cap)
+
+
+def _format_selector(audio_only, max_bytes):
+    if not audio_only:
+        return "mp4/best"
+    if max_bytes:
+        # smallest-fitting audio first, then any audio, then the smallest muxed file
+        return f"bestaudio[filesize<?{max_bytes}]/bestaudio/worst"
+    return "bestaudio/worst"
+
+
+def download_media(url, out_path, audio_only=None, max_duration=None, max_bytes=None):
+    """
+    Download `url` with yt-dlp to exactly `out_path`.
+    audio_only fetches just the best audio stream; max_duration downloads
+    only the first N seconds (range request via ffmpeg); max_bytes caps the file size.
+    """
+    audio_only = AUDIO_ONLY_DOWNLOAD if audio_only is None else audio_only
+    max_duration = MAX_MEDIA_DURATION if max_duration is None else max_duration
+    max_bytes = MAX_MEDIA_BYTES if max_bytes is None else max_bytes
+
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    ydl_opts = {
+        "outtmpl": out_path,  # exact output path
+        "format": _format_selector(audio_only, max_bytes),
+        "quiet": True,  # no console spam
+        "noplaylist": True,  # only download the single video
+    }
+    if not audio_only:
+        ydl_opts["merge_output_format"] = "mp4"
+    if max_bytes:
+        ydl_opts["max_filesize"] = max_bytes
+    if max_duration:
+        from yt_dlp.utils import download_range_func
+        ydl_opts["download_ranges"] = download_range_func(None, [(0, max_duration)])
+    try:
+        ydl_opts["ffmpeg_location"] = ffmpeg_binary()
+    except RuntimeError:
+        pass  # yt-dlp looks for ffmpeg itself
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([url])
+
+    if not os.path.exists(out_path):
+        raise RuntimeError("Download produced no file (over MAX_MEDIA_BYTES or no matching format)")
+    return out_path
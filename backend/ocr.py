@@ -0,0 +1,209 @@
+import os
+import time
+import threading
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageOps
+import pytesseract
+
+from workspace import read_upload, UploadTooLarge, MAX_UPLOAD_BYTES
+
+# tesserocr (in-process Tesseract API: no process launch per call) is only
+# imported inside the OCR workers, after OMP_THREAD_LIMIT is set there
+HAVE_TESSEROCR = importlib.util.find_spec("tesserocr") is not None
+
+# ----------------------
+# Config
+# ----------------------
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "2000"))  # downscale larger images (px, longest side)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+OCR_MAX_REGIONS = int(os.getenv("OCR_MAX_REGIONS", "8"))
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", str(50_000_000)))  # decompression-bomb guard
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_CONFIG = "--oem 1 --psm 6"  # LSTM engine, one uniform block of text per region
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """
+    Process pool for the regions. Each worker limits Tesseract to one thread
+    (regions already run in parallel) without touching this process's OpenMP
+    settings, and with tesserocr keeps one loaded engine.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                initargs=(pytesseract.pytesseract.tesseract_cmd,),
+            )
+        return _pool
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class ImageTooLarge(UploadTooLarge):
+    pass
+
+
+# ----------------------
+# Decoding
+# ----------------------
+def decode_upload(file_storage, max_bytes=MAX_UPLOAD_BYTES, max_pixels=OCR_MAX_PIXELS):
+    """Decode an uploaded image straight from memory (no temp file), see open_image"""
+    return open_image(read_upload(file_storage, max_bytes), max_pixels)
+
+
+def open_image(fp, max_pixels=OCR_MAX_PIXELS):
+    """
+    Open and decode an image (path or file object). The pixel count is checked
+    from the header before any pixel data is decoded, and large JPEGs are
+    decoded at reduced scale in grayscale via draft mode.
+    """
+    try:
+        image = Image.open(fp)
+    except Image.DecompressionBombError as e:  # PIL's own header check (> 2x MAX_IMAGE_PIXELS)
+        raise ImageTooLarge(str(e)) from e
+    width, height = image.size
+    if max_pixels and width * height > max_pixels:
+        image.close()
+        raise ImageTooLarge(f"Image has {width * height} pixels (limit {max_pixels})")
+    if max(width, height) > OCR_MAX_SIDE:
+        scale = OCR_MAX_SIDE / max(width, height)
+        image.draft("L", (int(width * scale), int(height * scale)))  # no-op for non-JPEG formats
+    image.load()
+    return image
+
+
+# ----------------------
+# Preprocessing
+# ----------------------
+def _otsu_threshold(gray):
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = total - weight_bg
+    cum_mean = np.cumsum(hist * levels)
+    mean_bg = cum_mean / np.maximum(weight_bg, 1)
+    mean_fg = (cum_mean[-1] - cum_mean) / np.maximum(weight_fg, 1)
+    between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(between))
+
+
+def preprocess_image(image):
+    """Grayscale, cap the size, and binarize to dark text on white (dark-mode screenshots are inverted)"""
+    gray = ImageOps.grayscale(ImageOps.exif_transpose(image))
+    if max(gray.size) > OCR_MAX_SIDE:
+        gray.thumbnail((OCR_MAX_SIDE, OCR_MAX_SIDE), Image.LANCZOS)
+    pixels = np.asarray(ImageOps.autocontrast(gray), dtype=np.uint8)
+    ink = pixels < _otsu_threshold(pixels)
+    if ink.mean() > 0.5:  # light text on a dark background
+        ink = ~ink
+    return ink
+
+
+# ----------------------
+# Text regions
+# ----------------------
+def _runs(mask):
+    """[(start, end)] of consecutive True values"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def detect_text_regions(ink, max_regions=OCR_MAX_REGIONS):
+    """
+    Projection-profile layout analysis: find text lines from row ink counts,
+    group lines into blocks separated by large vertical gaps, and crop each
+    block to its ink. Returns [(top, bottom, left, right)].
+    """
+    height, width = ink.shape
+    rows = ink.sum(axis=1) > max(2, width // 500)
+    lines = [(s, e) for s, e in _runs(rows) if e - s >= 4]
+    if not lines:
+        return []
+
+    line_height = int(np.median([e - s for s, e in lines]))
+    blocks = [list(lines[0])]
+    for start, end in lines[1:]:
+        if start - blocks[-1][1] <= line_height * 1.5:
+            blocks[-1][1] = end
+        else:
+            blocks.append([start, end])
+    # Too many blocks -> merge the closest neighbours (each block costs one tesseract launch)
+    while len(blocks) > max_regions:
+        gaps = [blocks[i + 1][0] - blocks[i][1] for i in range(len(blocks) - 1)]
+        i = int(np.argmin(gaps))
+        blocks[i:i + 2] = [[blocks[i][0], blocks[i + 1][1]]]
+
+    pad = max(4, line_height // 2)
+    regions = []
+    for top, bottom in blocks:
+        cols = np.flatnonzero(ink[top:bottom].any(axis=0))
+        if cols.size == 0:
+            continue
+        regions.append((max(0, top - pad), min(height, bottom + pad),
+                        max(0, int(cols[0]) - pad), min(width, int(cols[-1]) + 1 + pad)))
+    return regions
+
+
+# ----------------------
+# OCR
+# ----------------------
+_api = None  # per-process tesserocr engine
+
+
+def _init_ocr_worker(tesseract_cmd):
+    global _api
+    # inherited by the tesseract processes pytesseract launches; read by libgomp when tesserocr loads
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    if HAVE_TESSEROCR:
+        import tesserocr
+        _api = tesserocr.PyTessBaseAPI(lang=OCR_LANG, psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.LSTM_ONLY)
+
+
+def _ocr_array(ink):
+    image = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+    if _api is not None:
+        _api.SetImage(image)
+        return _api.GetUTF8Text().strip()
+    try:
+        return pytesseract.image_to_string(image, lang=OCR_LANG, config=OCR_CONFIG).strip()
+    except pytesseract.TesseractNotFoundError as e:
+        raise RuntimeError(str(e))  # doesn't survive pickling back from the worker (it would break the pool)
+
+
+def ocr_image(image):
+    """
+    OCR one PIL image: preprocess -> text regions -> regions OCR'd in parallel.
+    Returns {"text", "regions", "timings": {step: ms}}.
+    """
+    timings = {}
+    start = t = time.perf_counter()
+    ink = preprocess_image(image)
+    timings["preprocess_ms"] = _ms(t)
+
+    t = time.perf_counter()
+    regions = detect_text_regions(ink)
+    timings["regions_ms"] = _ms(t)
+
+    t = time.perf_counter()
+    crops = [ink[top:bottom, left:right] for top, bottom, left, right in regions]
+    texts = list(_get_pool().map(_ocr_array, crops)) if crops else []
+    text = "\n".join(tx for tx in texts if tx)
+    if not text:
+        text = _get_pool().submit(_ocr_array, ink).result()  # layout analysis found nothing usable: whole page
+    timings["ocr_ms"] = _ms(t)
+    timings["total_ms"] = _ms(start)
+    return {"text": text, "regions": len(regions), "timings": timings}
@@ -0,0 +1,59 @@
+import os
+from functools import partial
+
+from inference.predict import predict_with_max_voting, vectorize_text
+from inference.batching import predict_with_batching
+from inference.parallel import run_parallel
+from inference.result_cache import predict_ensemble_cached, predict_hatespeech_cached
+
+# ----------------------
+# Config
+# ----------------------
+# Micro-batching: concurrent requests share one forward pass per model
+ENABLE_MICRO_BATCHING = os.getenv("ENABLE_MICRO_BATCHING", "0") == "1"
+
+
+# ----------------------
+# Text scoring (shared by the routes in app.py and the job workers in jobs.py)
+# ----------------------
+def _compute_fake_news(texts, strategy=None):
+    if ENABLE_MICRO_BATCHING:
+        return [predict_with_batching(t, strategy=strategy) for t in texts]
+    return [predict_with_max_voting(t, vectorize_text(t), strategy=strategy) for t in texts]
+
+
+def run_fake_news_models(text, strategy=None):
+    """
+    Vectorize + max-voting ensemble (result-cached, batched across concurrent
+    requests if enabled). strategy: long-text handling, see token_budget.py.
+    """
+    compute = partial(_compute_fake_news, strategy=strategy)
+    return predict_ensemble_cached([text], compute, strategy)[0] or {}
+
+
+def run_hatespeech(text):
+    return predict_hatespeech_cached([text])[0]
+
+
+def run_text_models(text, strategy=None):
+    """(fake-news result, hate-speech result), computed concurrently"""
+    results = run_parallel({
+        "fake_news": lambda: run_fake_news_models(text, strategy),  # nests its own branches, so runs inline
+        "hate_speech": lambda: run_hatespeech(text),
+    })
+    return results["fake_news"], results["hate_speech"]
+
+
+def text_response(text, model_result, hate_result, **extra):
+    """Response body for a scored text: snippet, ensemble fields, hate speech, then `extra`"""
+    return {
+        "text_snippet": text[:500],
+        **model_result,
+        "hate_speech": hate_result,
+        "verified": False,
+        **extra,
+    }
+
+
+def score_text(text, strategy=None):
+    return text_response(text, *run_text_models(text, strategy))
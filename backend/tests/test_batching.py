@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from inference.batching import MicroBatcher
+
+
+def test_concurrent_calls_share_batches():
+    sizes = []
+    release = threading.Event()
+
+    def batch_fn(items):
+        release.wait(5)
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(10)]
+    release.set()
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(10)]
+    assert sum(sizes) == 10 and max(sizes) <= 4 and len(sizes) < 10
+    batcher.close()
+
+
+def test_batch_error_reaches_every_caller():
+    def batch_fn(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(batch_fn, max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(3)]
+    for f in futures:
+        with pytest.raises(ValueError, match="model failed"):
+            f.result(timeout=5)
+    batcher.close()
+
+
+def test_misaligned_results_are_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_wait_ms=20)
+    with pytest.raises(RuntimeError, match="returned"):
+        batcher(1, timeout=5)
+    batcher.close()
+
+
+def test_close_stops_worker_and_rejects_new_items():
+    batcher = MicroBatcher(lambda items: items, max_wait_ms=1)
+    assert batcher("x", timeout=5) == "x"
+    worker = batcher._worker
+    batcher.close()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit("y")
@@ -0,0 +1,67 @@
+import time
+
+from inference.cache import LRUCache, SQLiteCache, TieredCache, cached_batch, text_key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1 and cache.get("b") is None and cache.get("c") == 3
+
+
+def test_lru_byte_bound():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.set("c", "123")
+    assert cache.get("a") is None and cache.get("b") == "12345" and cache.bytes == 8
+    cache.set("b", "1")  # replacing an entry releases its old size
+    assert cache.bytes == 4
+    cache.set("big", "x" * 20)  # larger than the whole budget: not stored
+    assert cache.get("big") is None and cache.bytes == 4
+
+
+def test_lru_ttl(monkeypatch):
+    cache = LRUCache(ttl=10)
+    cache.set("a", 1)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_sqlite_ttl_and_eviction(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "c.db"), ttl=10, max_entries=10, evict_every=5)
+    for i in range(20):
+        cache.set(str(i), {"i": i})
+    assert len(cache) <= 10 + cache.evict_every
+    assert cache.get("19") == {"i": 19}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("19") is None
+
+
+def test_tiered_promotes_disk_hits(tmp_path):
+    path = str(tmp_path / "c.db")
+    TieredCache("t", memory_entries=10, disk_path=path).set("k", [1, 2])
+    cache = TieredCache("t", memory_entries=10, disk_path=path)  # another process: cold memory tier
+    assert cache.get("k") == [1, 2] and cache.get("k") == [1, 2]
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_cached_batch_computes_only_misses():
+    cache = TieredCache("t", memory_entries=10)
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [t.upper() for t in texts]
+
+    assert cached_batch(cache, ["a", "b"], "v1", compute) == ["A", "B"]
+    assert cached_batch(cache, ["a  ", "c"], "v1", compute) == ["A", "C"]  # normalized key
+    assert calls == [["a", "b"], ["c"]]
+    assert text_key("a", "v1") != text_key("a", "v2")
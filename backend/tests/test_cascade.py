@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pytest
+
+for module in ("torch", "transformers", "scipy", "serpapi"):
+    pytest.importorskip(module)
+from inference import predict  # noqa: E402
+
+# fake probability per text and model; "a" is confident at the CNN tier, "b" at
+# the RNN tier and "c" never is, so it falls through to the transformers
+FAKE_PROBS = {
+    "a": {"cnn": 0.97, "lstm": 0.5, "bilstm": 0.5, "distilbert": 0.5, "roberta": 0.5},
+    "b": {"cnn": 0.6, "lstm": 0.95, "bilstm": 0.7, "distilbert": 0.5, "roberta": 0.5},
+    "c": {"cnn": 0.6, "lstm": 0.6, "bilstm": 0.55, "distilbert": 0.8, "roberta": 0.3},
+}
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    calls = {}
+
+    def model(name):
+        def run(texts, vec, batch_size, strategy=None):
+            calls[name] = list(texts)
+            assert all(len(arr) == len(texts) for arr in vec.values())
+            return [{"fake": FAKE_PROBS[t][name], "real": 1 - FAKE_PROBS[t][name]} for t in texts]
+        return run
+
+    monkeypatch.setattr(predict, "_MODEL_BATCH_FNS", {name: model(name) for name in predict._MODEL_BATCH_FNS})
+    return calls
+
+
+@pytest.fixture
+def thresholds_file(tmp_path, monkeypatch):
+    def write(thresholds):
+        path = tmp_path / "cascade_thresholds.json"
+        path.write_text(json.dumps({"thresholds": thresholds}))
+        monkeypatch.setattr(predict, "CASCADE_THRESHOLDS_PATH", str(path))
+        predict.cascade_thresholds.cache_clear()
+    yield write
+    predict.cascade_thresholds.cache_clear()
+
+
+def vectors(n):
+    return {name: np.zeros((n, 4), dtype=np.int32) for name in predict.KERAS_SEQUENCE_SPECS}
+
+
+def test_cascade_exits_at_calibrated_thresholds(fake_models, thresholds_file):
+    thresholds_file({"cnn": 0.9, "rnn": 0.9})
+    results = predict.predict_cascade_batch(["a", "b", "c"], vectors(3))
+
+    assert [r["tier"] for r in results] == ["cnn", "rnn", "transformer"]
+    assert fake_models == {
+        "cnn": ["a", "b", "c"], "lstm": ["b", "c"], "bilstm": ["b", "c"],
+        "distilbert": ["c"], "roberta": ["c"],
+    }
+    assert set(results[0]["all_model_results"]) == {"cnn"}
+    assert results[1]["model_used"] == "lstm"
+    assert results[2]["model_used"] == "distilbert"
+
+
+def test_cascade_missing_tier_uses_default_threshold(fake_models, thresholds_file, monkeypatch):
+    monkeypatch.setattr(predict, "CASCADE_DEFAULT_THRESHOLD", 0.99)
+    thresholds_file({"rnn": 0.9})  # no "cnn" entry: 0.97 is below the default
+    results = predict.predict_cascade_batch(["a", "b"], vectors(2))
+
+    assert predict.cascade_thresholds() == {"cnn": 0.99, "rnn": 0.9}
+    assert [r["tier"] for r in results] == ["rnn", "rnn"]  # "a" exits on its CNN score at the next tier
+    assert "distilbert" not in fake_models
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from extraction import extract_paragraph_text, available_engines
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures", "html")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("engine", available_engines())
+@pytest.mark.parametrize("name, kept, dropped", [
+    ("wordpress_body_classes.html",
+     ["The city council approved", "restores two library branches", "Opponents said", "By Staff Reporter"],
+     ["Share this", "thoughts on this post", "Popular this week", "Copyright", "uses cookies", "Local news since"]),
+    ("article_in_comments_wrapper.html",
+     ["The central bank raised", "Policymakers voted", "Markets had largely priced in"],
+     ["Share on social media", "Related:", "Reader comment"]),
+    ("cookie_banner_and_related.html",
+     ["Researchers at a European university", "published in a peer-reviewed journal"],
+     ["We use cookies", "Sign up now", "Related:", "User123"]),
+])
+def test_boilerplate_keeps_content_ancestors(engine, name, kept, dropped):
+    text = extract_paragraph_text(fixture(name), max_chars=None, engine=engine, drop_boilerplate=True)
+    for snippet in kept:
+        assert snippet in text
+    for snippet in dropped:
+        assert snippet not in text
+
+
+def test_engines_agree():
+    for name in os.listdir(FIXTURES_DIR):
+        html = fixture(name)
+        outputs = {e: extract_paragraph_text(html, engine=e, drop_boilerplate=True) for e in available_engines()}
+        assert len(set(outputs.values())) == 1, (name, outputs)
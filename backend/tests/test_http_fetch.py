@@ -0,0 +1,23 @@
+import http_fetch
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code, self.text, self.headers = status_code, text, headers or {}
+
+
+def test_304_after_eviction_refetches(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout, headers):
+        calls.append(headers)
+        if headers:
+            http_fetch._validators.clear()  # evicted while the request was in flight
+            return FakeResponse(304)
+        return FakeResponse(200, "fresh body", {"ETag": '"v2"'})
+
+    monkeypatch.setattr(http_fetch, "_get", fake_get)
+    http_fetch._validators.set("https://example.com/a", {"etag": '"v1"', "last_modified": None, "text": "old"})
+    assert http_fetch.fetch_text("https://example.com/a") == "fresh body"
+    assert calls == [{"If-None-Match": '"v1"'}, {}]
+    assert http_fetch._validators.get("https://example.com/a")["etag"] == '"v2"'
@@ -0,0 +1,27 @@
+import pytest
+from PIL import Image
+
+from ocr import open_image, ImageTooLarge
+
+
+def save_png(tmp_path, size):
+    path = tmp_path / "image.png"
+    Image.new("L", size, 255).save(path)
+    return str(path)
+
+
+def test_open_image_decodes_within_limit(tmp_path):
+    with open_image(save_png(tmp_path, (40, 30)), max_pixels=1200) as image:
+        assert image.size == (40, 30)
+
+
+def test_open_image_rejects_too_many_pixels(tmp_path):
+    with pytest.raises(ImageTooLarge):
+        open_image(save_png(tmp_path, (40, 31)), max_pixels=1200)
+
+
+def test_open_image_maps_pil_bomb_error(tmp_path, monkeypatch):
+    path = save_png(tmp_path, (40, 30))
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 500)  # PIL raises above 2x this
+    with pytest.raises(ImageTooLarge):
+        open_image(path, max_pixels=None)
@@ -0,0 +1,70 @@
+# Smoke tests for the optional inference backends: tiny randomly initialised
+# models are exported/converted and checked with the same parity code the
+# CLIs use. Each test is skipped when its optional runtime isn't installed.
+import numpy as np
+import pytest
+
+from inference.parity import PARITY_TEXTS, compare_probs
+
+
+def test_compare_probs_sigmoid_and_softmax():
+    report = compare_probs([[0.2], [0.9]], [[0.21], [0.88]], atol=0.05)
+    assert report["ok"] and report["label_agreement"] == 1.0
+
+    report = compare_probs([[0.6, 0.4]], [[0.4, 0.6]], atol=0.5)
+    assert not report["ok"]  # within atol, but the label flipped
+
+
+def _tiny_distilbert(tmp_path):
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("torch")
+
+    words = sorted({w.strip(".,").lower() for text in PARITY_TEXTS for w in text.split()})
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]) + "\n")
+    tokenizer = transformers.DistilBertTokenizerFast(vocab_file=str(vocab))
+    config = transformers.DistilBertConfig(
+        vocab_size=len(words) + 5, dim=32, hidden_dim=64, n_layers=1, n_heads=2, num_labels=2
+    )
+    model = transformers.DistilBertForSequenceClassification(config).eval()
+    return tokenizer, model
+
+
+def test_onnx_parity(tmp_path):
+    pytest.importorskip("onnxruntime")
+    from inference.onnx_backend import export_to_onnx, OnnxSequenceClassifier, check_parity
+
+    tokenizer, model = _tiny_distilbert(tmp_path)
+    path = export_to_onnx(tokenizer, model, str(tmp_path / "tiny.onnx"))
+    report = check_parity(tokenizer, model, OnnxSequenceClassifier(path))
+    assert report["ok"], report
+
+
+def _tiny_bilstm():
+    tf = pytest.importorskip("tensorflow")
+    tf.random.set_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(20,)),
+        tf.keras.layers.Embedding(50, 8),
+        tf.keras.layers.Bidirectional(tf.keras.layers.LSTM(4)),
+        tf.keras.layers.Dense(1, activation="sigmoid"),
+    ])
+    X = np.random.default_rng(0).integers(0, 50, size=(len(PARITY_TEXTS), 20))
+    return model, X
+
+
+def test_tf_function_parity():
+    from inference.tflite_backend import KerasFunctionModel, check_parity
+
+    model, X = _tiny_bilstm()
+    report = check_parity(model, KerasFunctionModel(model), X)
+    assert report["ok"], report
+
+
+def test_tflite_parity(tmp_path):
+    from inference.tflite_backend import convert_to_tflite, TFLiteClassifier, check_parity
+
+    model, X = _tiny_bilstm()
+    path = convert_to_tflite(model, str(tmp_path / "tiny.tflite"), "fp32")
+    report = check_parity(model, TFLiteClassifier(path), X)
+    assert report["ok"], report
@@ -0,0 +1,52 @@
+import pytest
+
+from inference.token_budget import head_tail, sliding_windows, plan_segments, pool_probs
+
+IDS = list(range(20))
+
+
+@pytest.mark.parametrize("budget, head, expected", [
+    (25, 4, IDS),                                   # fits: unchanged
+    (20, 4, IDS),
+    (8, 3, [0, 1, 2, 15, 16, 17, 18, 19]),
+    (8, 8, [0, 1, 2, 3, 4, 5, 6, 7]),              # no tail
+    (8, 12, [0, 1, 2, 3, 4, 5, 6, 7]),             # head capped at the budget
+    (8, 0, [12, 13, 14, 15, 16, 17, 18, 19]),
+])
+def test_head_tail(budget, head, expected):
+    assert head_tail(IDS, budget, head) == expected
+
+
+def test_sliding_windows_cover_everything_with_overlap():
+    windows = sliding_windows(IDS, 8, overlap=2, max_windows=None)
+    assert [w[0] for w in windows] == [0, 6, 12]
+    assert all(len(w) == 8 for w in windows)
+    assert windows[-1][-1] == IDS[-1]
+    assert sorted(set(i for w in windows for i in w)) == IDS
+
+
+def test_sliding_windows_short_text_is_one_window():
+    assert sliding_windows(IDS[:5], 8) == [IDS[:5]]
+    assert sliding_windows([], 8) == [[]]
+
+
+def test_sliding_windows_capped_and_evenly_spaced():
+    windows = sliding_windows(IDS, 4, overlap=0, max_windows=3)
+    assert [w[0] for w in windows] == [0, 8, 16]
+    assert windows[-1] == IDS[-4:]
+
+
+def test_plan_segments_strategies():
+    token_ids = [IDS, IDS[:3]]
+    assert plan_segments(token_ids, 8, "truncate") == [(0, head_tail(IDS, 8)), (1, IDS[:3])]
+    window = plan_segments(token_ids, 8, "window")
+    assert [i for i, _ in window] == [0] * len(sliding_windows(IDS, 8)) + [1]
+    assert all(len(ids) <= 8 for _, ids in window)
+
+
+def test_pool_probs():
+    probs = [{"fake": 0.9, "real": 0.1}, {"fake": 0.2, "real": 0.8}, {"fake": 0.4, "real": 0.6}]
+    mean = pool_probs(probs, "mean")
+    assert mean["fake"] == pytest.approx(0.5) and mean["real"] == pytest.approx(0.5)
+    assert pool_probs(probs, "max") == probs[0]
+    assert pool_probs(probs[1:2], "mean") is probs[1]
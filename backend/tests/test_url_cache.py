@@ -0,0 +1,20 @@
+import pytest
+
+from url_cache import canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Www.Example.com:443/news/story?utm_source=x&b=2&a=1#top", "https://www.example.com/news/story?a=1&b=2"),
+    ("https://www.google.com/amp/s/example.com/news/story/amp", "https://example.com/news/story"),
+    ("https://example-com.cdn.ampproject.org/c/s/example.com/news/story.amp.html",
+     "https://example.com/news/story.html"),
+    ("https://amp.example.com/news/story?fbclid=1&gclid=2", "https://example.com/news/story"),
+    ("example.com//news/story/", "https://example.com/news/story"),
+    ("http://example.com:8080/x?id=5", "http://example.com:8080/x?id=5"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_content_params_are_kept():
+    assert canonicalize_url("https://example.com/article?id=1") != canonicalize_url("https://example.com/article?id=2")
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from inference.parity import PARITY_TEXTS
+from inference.vocab import CompiledVocab
+
+pytest.importorskip("tensorflow")
+from tensorflow.keras.preprocessing.sequence import pad_sequences  # noqa: E402
+from tensorflow.keras.preprocessing.text import Tokenizer  # noqa: E402
+
+TRAIN_TEXTS = [
+    "Breaking: the council approved the new budget on Tuesday.",
+    "Scientists say the vaccine trial met its primary endpoint!",
+    "You won't BELIEVE what this celebrity said about the election...",
+    "Officials confirmed the bridge will reopen next month.",
+]
+TEXTS = PARITY_TEXTS + [
+    "",
+    "unknownword another-unknown",
+    "the " * 30,  # longer than maxlen below
+    "Council, council; COUNCIL\tbudget\nbudget",
+]
+
+
+def tokenizer(**kwargs):
+    tok = Tokenizer(**kwargs)
+    tok.fit_on_texts(TRAIN_TEXTS)
+    return tok
+
+
+@pytest.mark.parametrize("tokenizers", [
+    {"plain": tokenizer()},
+    {"oov": tokenizer(oov_token="<OOV>")},
+    {"capped": tokenizer(num_words=8), "capped_oov": tokenizer(num_words=8, oov_token="<OOV>")},
+    {"cased": tokenizer(lower=False), "plain": tokenizer()},
+])
+@pytest.mark.parametrize("spec", [
+    {"maxlen": 12, "padding": "pre", "truncating": "pre"},
+    {"maxlen": 12, "padding": "post", "truncating": "post"},
+    {"maxlen": 5, "padding": "pre", "truncating": "post"},
+])
+def test_compiled_vocab_matches_keras(tokenizers, spec):
+    vocab = CompiledVocab(tokenizers, {name: spec for name in tokenizers})
+    out = vocab.vectorize(TEXTS)
+    for name, tok in tokenizers.items():
+        expected = pad_sequences(tok.texts_to_sequences(TEXTS), **spec)
+        np.testing.assert_array_equal(out[name], expected, err_msg=name)
+
+
+def test_compiled_vocab_empty_batch():
+    out = CompiledVocab({"plain": tokenizer()}, {"plain": {"maxlen": 7}}).vectorize([])
+    assert out["plain"].shape == (0, 7)
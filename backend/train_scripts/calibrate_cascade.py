@@ -0,0 +1,97 @@
+# Calibrate the early-exit thresholds for ENSEMBLE_MODE=cascade.
+#
+#   cd backend
+#   python -m train_scripts.calibrate_cascade dataset/final_dataset.csv [--target 0.99] [--limit 5000]
+#
+# Every model runs on the calibration texts. For each tier (except the last),
+# this picks the lowest confidence threshold at which the texts that would stop
+# there still get the same fake/real verdict as the full five-model ensemble
+# on at least --target of cases. The result goes to models/cascade_thresholds.json.
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from inference.predict import (
+    CASCADE_TIERS, CASCADE_THRESHOLDS_PATH, _MODEL_BATCH_FNS, vectorize_texts
+)
+
+
+def verdicts(probs):
+    return np.array([p["fake"] > p["real"] for p in probs])
+
+
+def confidences(probs):
+    return np.array([max(p["fake"], p["real"]) for p in probs])
+
+
+def calibrate(texts, target, min_exits):
+    vec = vectorize_texts(texts)
+    per_model = {}
+    for name in _MODEL_BATCH_FNS:
+        print(f"Running {name} on {len(texts)} texts...")
+        per_model[name] = _MODEL_BATCH_FNS[name](texts, vec, 32)
+
+    # Reference answer: the most confident of all five models ("all" mode)
+    conf = np.stack([confidences(per_model[m]) for m in per_model])
+    verd = np.stack([verdicts(per_model[m]) for m in per_model])
+    full = verd[conf.argmax(axis=0), np.arange(len(texts))]
+
+    thresholds, report = {}, {}
+    remaining = np.ones(len(texts), dtype=bool)
+    seen = []
+    for tier, models in CASCADE_TIERS[:-1]:
+        seen += models
+        rows = [list(per_model).index(m) for m in seen]
+        tier_conf = conf[rows].max(axis=0)
+        tier_verd = verd[rows][conf[rows].argmax(axis=0), np.arange(len(texts))]
+
+        chosen = 1.0  # nobody exits unless a threshold meets the target
+        for t in np.unique(np.round(tier_conf[remaining], 4)):
+            exits = remaining & (tier_conf >= t)
+            if exits.sum() < min_exits:
+                break
+            if (tier_verd[exits] == full[exits]).mean() >= target:
+                chosen = float(t)
+                break
+        exits = remaining & (tier_conf >= chosen)
+        thresholds[tier] = chosen
+        report[tier] = {
+            "exits": int(exits.sum()),
+            "agreement": float((tier_verd[exits] == full[exits]).mean()) if exits.any() else None,
+        }
+        remaining &= ~exits
+    report[CASCADE_TIERS[-1][0]] = {"exits": int(remaining.sum()), "agreement": 1.0}
+    return thresholds, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv", help="CSV with a 'text' column (labels are not needed)")
+    parser.add_argument("--target", type=float, default=0.99, help="agreement with the full ensemble per tier")
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--min-exits", type=int, default=20)
+    parser.add_argument("--out", default=CASCADE_THRESHOLDS_PATH)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    df = df.sample(n=min(args.limit, len(df)), random_state=42)
+    texts = df["text"].astype(str).tolist()
+
+    thresholds, report = calibrate(texts, args.target, args.min_exits)
+    for tier, stats in report.items():
+        print(f"{tier:<12} threshold={thresholds.get(tier, '-')!s:<8} exits={stats['exits']:<6} "
+              f"agreement={stats['agreement']}")
+
+    with open(args.out, "w") as f:
+        json.dump({"thresholds": thresholds, "target_agreement": args.target,
+                   "calibrated_on": len(texts), "report": report}, f, indent=2)
+    print("Saved", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import threading
+import importlib.util
+from functools import lru_cache
+
+from inference.registry import registry
+
+# ----------------------
+# Config
+# ----------------------
+# "auto" uses faster-whisper (CTranslate2) when installed, else openai-whisper
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "auto").lower()
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # faster-whisper only
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", "0"))  # faster-whisper cpu_threads, 0 = library default
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", "1"))  # concurrent transcriptions (faster-whisper)
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "5"))
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(backend=WHISPER_BACKEND):
+    """"auto" -> "faster-whisper" if installed, else "whisper" (without loading a model)"""
+    if backend != "auto":
+        return backend
+    return "faster-whisper" if importlib.util.find_spec("faster_whisper") else "whisper"
+
+
+def transcript_signature():
+    """What changes transcript text: resolved backend, model size, and compute type for faster-whisper"""
+    backend = resolve_backend()
+    extra = f":{WHISPER_COMPUTE_TYPE}" if backend == "faster-whisper" else ""
+    return f"{backend}:{WHISPER_MODEL_SIZE}{extra}"
+
+
+class TranscriptionService:
+    """
+    One shared, warm Whisper model for the whole process.
+    `audio` may be a file path or a 16 kHz mono float32 NumPy array.
+    """
+
+    def __init__(self, backend=WHISPER_BACKEND, model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE):
+        backend = resolve_backend(backend)
+        self.backend = backend
+        self.model_size = model_size
+        self.compute_type = compute_type
+        # openai-whisper installs per-call hooks on the model, so calls must not overlap
+        self._lock = threading.Lock()
+
+        if backend == "faster-whisper":
+            from faster_whisper import WhisperModel
+
+            self.model = WhisperModel(
+                model_size, device="cpu", compute_type=compute_type,
+                cpu_threads=WHISPER_THREADS, num_workers=WHISPER_WORKERS,
+            )
+        elif backend == "whisper":
+            import whisper
+            from inference.parallel import configure_torch
+
+            # shares the process-wide PyTorch pool with the transformers (TORCH_THREADS)
+            configure_torch()
+            self.model = whisper.load_model(model_size)
+        else:
+            raise ValueError(f"Unknown WHISPER_BACKEND: {backend}")
+
+    def transcribe_segments(self, audio, **kwargs):
+        """[{"start", "end", "text"}] for the whole input"""
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(audio, beam_size=kwargs.pop("beam_size", WHISPER_BEAM_SIZE), **kwargs)
+            return [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+        with self._lock:
+            result = self.model.transcribe(audio, fp16=False, **kwargs)
+        return [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result.get("segments", [])]
+
+    def transcribe(self, audio, **kwargs):
+        segments = self.transcribe_segments(audio, **kwargs)
+        return "".join(s["text"] for s in segments).strip()
+
+
+registry.register("whisper", TranscriptionService)
+
+
+def get_transcriber():
+    return registry.get("whisper")
+
+
+def transcribe(audio, **kwargs):
+    """Transcript text of `audio` using the shared model"""
+    return get_transcriber().transcribe(audio, **kwargs)
@@ -0,0 +1,105 @@
+import os
+import re
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from inference.cache import TieredCache
+
+# ----------------------
+# Config
+# ----------------------
+ARTICLE_CACHE_SIZE = int(os.getenv("ARTICLE_CACHE_SIZE", "5000"))  # in-process entries, 0 disables
+ARTICLE_CACHE_DB = os.getenv("ARTICLE_CACHE_DB", "")  # SQLite path for the shared disk tier (off if empty)
+ARTICLE_CACHE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", "21600"))  # seconds, 0 = no expiry
+ARTICLE_CACHE_DISK_MAX = int(os.getenv("ARTICLE_CACHE_DISK_MAX", "100000"))
+
+# Query params that never change the article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "yclid",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "smid", "smtyp", "spm", "_ga", "_gl",
+    "amp", "outputtype", "s_cid", "share", "si",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+_GOOGLE_AMP = re.compile(r"^/amp/(s/)?(?P<rest>.+)$")
+_AMP_CACHE = re.compile(r"^/[cvi]/(s/)?(?P<rest>.+)$")
+
+article_cache = TieredCache(
+    "articles", ARTICLE_CACHE_SIZE, ARTICLE_CACHE_DB or None, ARTICLE_CACHE_TTL or None, ARTICLE_CACHE_DISK_MAX
+)
+
+
+# ----------------------
+# Canonicalization
+# ----------------------
+def _unwrap_amp_cache(host, path, query):
+    """google.com/amp/s/... and *.cdn.ampproject.org/c/s/... -> the publisher URL"""
+    match = None
+    if host.endswith("google.com"):
+        match = _GOOGLE_AMP.match(path)
+    elif host.endswith(".cdn.ampproject.org"):
+        match = _AMP_CACHE.match(path)
+    if not match:
+        return None
+    scheme = "https" if match.group(1) else "http"
+    inner = f"{scheme}://{match.group('rest')}"
+    return f"{inner}?{query}" if query else inner
+
+
+def _strip_amp_path(path):
+    for suffix in ("/amp/", "/amp", ".amp.html", ".amp"):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)] + (".html" if suffix == ".amp.html" else "")
+            break
+    if path.startswith("/amp/"):
+        path = path[len("/amp"):]
+    return path
+
+
+def canonicalize_url(url):
+    """
+    Normalize a news URL so tracking/AMP/fragment variants share one cache entry:
+    lowercase scheme/host, drop default ports, fragments, utm_* and similar
+    params, unwrap AMP caches and strip /amp path variants.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+
+    unwrapped = _unwrap_amp_cache(host, parts.path, parts.query)
+    if unwrapped:
+        return canonicalize_url(unwrapped)
+
+    if host.startswith("amp."):
+        host = host[len("amp."):]
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = _strip_amp_path(parts.path or "/")
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1 and path.endswith("/"):
+        path = path[:-1]
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _url_key(url):
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+
+# ----------------------
+# Cached extraction
+# ----------------------
+def get_cached_article(url):
+    return article_cache.get(_url_key(url))
+
+
+def cache_article(url, text):
+    if text:
+        article_cache.set(_url_key(url), text)
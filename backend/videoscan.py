@@ -1,6 +1,5 @@
 # video_scan.py
 import os
-import tempfile
 import shutil
 import time
 import json
@@ -8,15 +7,21 @@ import requests
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 from typing import Optional, Dict, Any
-import yt_dlp
 
 # load environment
 from dotenv import load_dotenv
 load_dotenv()
 
 # media & transcribe
-import whisper
-from moviepy.editor import VideoFileClip
+import numpy as np
+from audio import load_audio
+from media_download import download_media
+from workspace import new_workspace, remove_workspace, save_upload
+from media_cache import (
+    media_key_from_url, media_key_from_upload,
+    get_transcript as get_cached_transcript, set_transcript as set_cached_transcript,
+)
+from transcription import get_transcriber
 from pytube import YouTube
 
 # selenium (optional Instagram downloader)
@@ -49,10 +54,7 @@ except Exception:
     except Exception:
         fact_check_article = None
 
-# Load Whisper model once
-print("Loading Whisper model (this may take a while)...")
-_whisper_model = whisper.load_model("base")
-print("Whisper model loaded.")
+# Whisper model is shared with app.py and loaded on first use (transcription.py)
 
 
 ####################
@@ -61,22 +63,10 @@ print("Whisper model loaded.")
 def _download_youtube(youtube_url: str, out_path: str) -> str:
     """
     Download a YouTube video (including Shorts) using yt-dlp.
+    Only the audio stream is fetched unless AUDIO_ONLY_DOWNLOAD=0 (see media_download.py).
     Returns the path to the downloaded file.
     """
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-    ydl_opts = {
-        'outtmpl': out_path,  # exact output path
-        'format': 'mp4',  # best mp4 format available
-        'quiet': True,  # no console spam
-        'noplaylist': True,  # only download the single video
-        'merge_output_format': 'mp4',  # ensure mp4 output
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([youtube_url])
-
-    return out_path
+    return download_media(youtube_url, out_path)
 
 
 def _download_instagram_reel(insta_url: str, out_path: str, headless: bool = True, timeout: int = 25) -> str:
@@ -130,20 +120,14 @@ def _download_instagram_reel(insta_url: str, out_path: str, headless: bool = Tru
             pass
 
 
-def _extract_audio_from_video(video_path: str, out_audio_path: str) -> str:
-    clip = VideoFileClip(video_path)
-    if clip.audio is None:
-        clip.close()
-        raise RuntimeError("Video has no audio track.")
-    clip.audio.write_audiofile(out_audio_path, fps=16000, nbytes=2, codec='pcm_s16le')
-    clip.close()
-    return out_audio_path
+def _extract_audio_from_video(video_path: str) -> np.ndarray:
+    """16 kHz mono float32 audio decoded in memory through an ffmpeg pipe"""
+    return load_audio(video_path)
 
 
-def _transcribe_with_whisper(audio_path: str) -> str:
+def _transcribe_with_whisper(audio) -> str:
     try:
-        result = _whisper_model.transcribe(audio_path)
-        return result.get("text", "").strip()
+        return get_transcriber().transcribe(audio)
     except Exception as e:
         raise RuntimeError(f"Whisper transcription error: {e}")
 
@@ -225,31 +209,39 @@ def process_video_input(youtube_url: Optional[str] = None,
     Main function to handle a video input (youtube url, instagram url, or uploaded file)
     Returns the same response shape used by the frontend (transcription, model_result, fact_check, related_articles, etc.)
     """
-    tmpdir = tempfile.mkdtemp(prefix="video_scan_")
+    # media identity: platform video ID or upload content hash
+    if youtube_url or instagram_url:
+        media_key = media_key_from_url(youtube_url or instagram_url)
+    elif video_file is not None:
+        media_key = media_key_from_upload(video_file)
+    else:
+        raise RuntimeError("No video input provided.")
+
+    tmpdir = new_workspace("video_scan_")
     try:
-        target_video_path = os.path.join(tmpdir, "input_video.mp4")
-
-        # handle inputs
-        if youtube_url:
-            _download_youtube(youtube_url, target_video_path)
-        elif instagram_url:
-            _download_instagram_reel(instagram_url, target_video_path)
-        elif video_file is not None:
-            # video_file is a Werkzeug FileStorage from Flask; save it
-            filename = getattr(video_file, "filename", "upload.mp4") or "upload.mp4"
-            saved = os.path.join(tmpdir, filename)
-            video_file.save(saved)
-            # ensure consistent name
-            shutil.move(saved, target_video_path)
-        else:
-            raise RuntimeError("No video input provided.")
+        transcription = get_cached_transcript(media_key)
+        if not transcription:
+            target_video_path = os.path.join(tmpdir, "input_video.mp4")
+
+            # handle inputs
+            if youtube_url:
+                _download_youtube(youtube_url, target_video_path)
+            elif instagram_url:
+                _download_instagram_reel(instagram_url, target_video_path)
+            else:
+                # video_file is a Werkzeug FileStorage from Flask; save it
+                filename = secure_filename(getattr(video_file, "filename", "") or "") or "upload.mp4"
+                saved = os.path.join(tmpdir, filename)
+                save_upload(video_file, saved)
+                # ensure consistent name
+                shutil.move(saved, target_video_path)
 
-        # extract audio
-        audio_path = os.path.join(tmpdir, "audio.wav")
-        _extract_audio_from_video(target_video_path, audio_path)
+            # extract audio (in memory, no temp WAV)
+            audio = _extract_audio_from_video(target_video_path)
 
-        # transcribe audio
-        transcription = _transcribe_with_whisper(audio_path)
+            # transcribe audio
+            transcription = _transcribe_with_whisper(audio)
+            set_cached_transcript(media_key, transcription)
 
         # predictions
         try:
@@ -291,7 +283,7 @@ def process_video_input(youtube_url: Optional[str] = None,
             except Exception:
                 output_model_result = model_result
 
-        return {
+        result = {
             "transcription": transcription,
             "text_snippet": (transcription or "")[:400],
             "model_result": output_model_result,
@@ -300,9 +292,7 @@ def process_video_input(youtube_url: Optional[str] = None,
             "fact_check": fact_check,
             "final_decision": final_decision
         }
+        return result
 
     finally:
-        try:
-            shutil.rmtree(tmpdir)
-        except Exception:
-            pass
\ No newline at end of file
+        remove_workspace(tmpdir)
\ No newline at end of file
@@ -0,0 +1,70 @@
+import io
+import os
+import shutil
+import tempfile
+
+# ----------------------
+# Config
+# ----------------------
+# WORKSPACE_TMPFS=1 keeps media in RAM (/dev/shm) when available; WORKSPACE_DIR overrides the location
+WORKSPACE_TMPFS = os.getenv("WORKSPACE_TMPFS", "0") == "1"
+WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))  # per request
+_COPY_CHUNK = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def workspace_root():
+    if WORKSPACE_DIR:
+        os.makedirs(WORKSPACE_DIR, exist_ok=True)
+        return WORKSPACE_DIR
+    if WORKSPACE_TMPFS and os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return None  # system temp dir
+
+
+def new_workspace(prefix="factify_"):
+    """Private directory for one request/job; the caller removes it (see remove_workspace)"""
+    return tempfile.mkdtemp(prefix=prefix, dir=workspace_root())
+
+
+def remove_workspace(path):
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def save_upload(file_storage, dest_path, max_bytes=MAX_UPLOAD_BYTES):
+    """Stream a Werkzeug upload to disk in chunks, aborting once max_bytes is exceeded"""
+    stream = file_storage.stream
+    written = 0
+    try:
+        with open(dest_path, "wb") as out:
+            for chunk in iter(lambda: stream.read(_COPY_CHUNK), b""):
+                written += len(chunk)
+                if max_bytes and written > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                out.write(chunk)
+    except UploadTooLarge:
+        os.remove(dest_path)
+        raise
+    return dest_path
+
+
+def read_upload(file_storage, max_bytes=MAX_UPLOAD_BYTES):
+    """Read a Werkzeug upload into memory (BytesIO), aborting once max_bytes is exceeded"""
+    stream = file_storage.stream
+    if isinstance(stream, io.BytesIO):  # already held in memory by the request parser
+        if max_bytes and stream.getbuffer().nbytes > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        stream.seek(0)
+        return stream
+    buffer = io.BytesIO()
+    for chunk in iter(lambda: stream.read(_COPY_CHUNK), b""):
+        if max_bytes and buffer.tell() + len(chunk) > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer